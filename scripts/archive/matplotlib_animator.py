@@ -1,6 +1,7 @@
 import trimesh
 import numpy as np
 import os
+import sys
 from pathlib import Path
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
@@ -11,6 +12,8 @@ import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 
 _ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_ROOT / "scripts"))
+from mesh_cache import load_normalized
 _AB25 = _ROOT / "data" / "abstract-25"
 
 ### === CONFIGURATION === ###
@@ -127,11 +130,9 @@ def create_animation(stl_path, output_path, object_size=2.0):
     """Create animation from STL file"""
     print(f"Processing {stl_path}")
     
-    # Load the STL file
-    mesh = trimesh.load(stl_path)
-    
-    # Center and scale the mesh
-    object_size = center_and_scale_mesh(mesh, target_size=object_size)
+    # Load the welded, centered, unit-scaled mesh through the shared cache
+    cached = load_normalized(stl_path)
+    mesh = trimesh.Trimesh(cached['vertices'] * object_size, cached['faces'], process=False)
     
     # Create temporary directory for frames
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -0,0 +1,53 @@
+"""
+Blender benchmark: per-frame scene sync time with and without persistent render data.
+
+./blender-4.5.0-linux-x64/blender -b -P scripts/bench_persistent_data.py -- path/to/file.stl [--frames 24] [--profile draft]
+"""
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+_scripts = Path(__file__).resolve().parent
+if str(_scripts) not in sys.path:
+    sys.path.insert(0, str(_scripts))
+
+import stl_spin_render as ssr
+
+
+def bench(stl_path, persistent):
+    ssr.apply_persistent_data(persistent)
+    ssr.clear_scene()
+    obj = ssr.import_stl(stl_path)
+    object_size = ssr.center_and_scale_object(obj, target_size=2.0)
+    ssr.setup_scene(obj, object_size)
+    ssr.animate_rotation(obj, ssr.frames)
+    with tempfile.TemporaryDirectory() as tmp, ssr.FrameStats() as stats:
+        ssr.render_video(os.path.join(tmp, "bench.mp4"))
+    return stats
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else float("nan")
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="bench_persistent_data")
+    parser.add_argument("stl")
+    parser.add_argument("--frames", type=int, default=24)
+    parser.add_argument("--profile", default="draft", choices=sorted(ssr.profiles))
+    args = parser.parse_args(argv)
+    ssr.apply_profile(args.profile)
+    ssr.frames = args.frames
+    print(f"{'mode':<12}{'sync ms (all)':>16}{'sync ms (2..n)':>16}{'s/frame':>10}")
+    for persistent in (False, True):
+        stats = bench(args.stl, persistent)
+        syncs = [f["sync"] for f in stats.frames if f["sync"] is not None]
+        seconds = [f["seconds"] for f in stats.frames]
+        label = "persistent" if persistent else "rebuild"
+        print(f"{label:<12}{_mean(syncs) * 1000:>16.1f}{_mean(syncs[1:]) * 1000:>16.1f}{_mean(seconds):>10.3f}")
+
+
+main()
@@ -3,6 +3,9 @@ import json
 import pandas as pd
 import numpy as np
 import glob
+import fnmatch
+
+from stl_pack import StlPack
 
 class StimulusDatabase:
     def __init__(self, stl_params_dir="/Users/samahabdelrahim/git-repos/BlenderObjects/stl_parameters/"):
@@ -10,17 +13,27 @@ class StimulusDatabase:
         self.df = None
         self.parameter_ranges = {}
         
-    def load_parameters(self):
-        """Load all parameter files into a pandas DataFrame"""
-        data = []
-        
+    def _iter_param_files(self, pack_path=None):
+        """Yield (param_file, params) from loose JSON files, or from the sidecars of an stl_pack.py archive"""
+        if pack_path is not None:
+            pack = StlPack(pack_path)
+            for name, params in pack.sidecars.items():
+                if fnmatch.fnmatch(os.path.basename(name), "shape_generator_object_*.json"):
+                    yield os.path.join(self.stl_params_dir, name), params
+            return
+
         # Get all JSON parameter files
         param_files = glob.glob(os.path.join(self.stl_params_dir, "shape_generator_object_*.json"))
-        
+
         for param_file in param_files:
             with open(param_file, 'r') as f:
-                params = json.load(f)
-                
+                yield param_file, json.load(f)
+
+    def load_parameters(self, pack_path=None):
+        """Load all parameter files into a pandas DataFrame (pack_path: read them from one STL pack instead)"""
+        data = []
+        
+        for param_file, params in self._iter_param_files(pack_path):
             # Extract base filename without extension
             base_name = os.path.splitext(os.path.basename(param_file))[0]
             complexity_level = params['complexity_level']
@@ -84,6 +97,37 @@ class StimulusDatabase:
             
         return self.df
     
+    def join_timings(self, timings_file):
+        """Join per-job render timings (stl_spin_render JSON lines) on the STL path; latest record wins"""
+        if self.df is None:
+            raise ValueError("Must load parameters first using load_parameters()")
+
+        rows = {}
+        with open(timings_file, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                row = {
+                    'stl_path': os.path.abspath(record['stl_path']),
+                    'vertices': record.get('vertices'),
+                    'faces': record.get('faces'),
+                    'peak_rss_mb': record.get('peak_rss_mb'),
+                }
+                for stage, timing in record['stages'].items():
+                    if timing:
+                        row[f'{stage}_wall'] = timing['wall']
+                        row[f'{stage}_cpu'] = timing['cpu']
+                row['total_wall'] = sum(t['wall'] for t in record['stages'].values() if t)
+                rows[row['stl_path']] = row
+
+        timings = pd.DataFrame(list(rows.values()))
+        if timings.empty:
+            return self.df
+        self.df['stl_path'] = self.df['stl_file'].map(os.path.abspath)
+        self.df = self.df.merge(timings, how='left', on='stl_path').drop(columns=['stl_path'])
+        return self.df
+
     def save_database(self, output_file='stimulus_database.csv'):
         """Save the database to a CSV file"""
         if self.df is not None:
@@ -0,0 +1,258 @@
+"""
+Numbered frame sequences → video with a local ffmpeg. No bpy import.
+Used by stl_spin_render.py's --sequence mode; outputs are written to a temp name and renamed.
+"""
+import os
+import shutil
+import subprocess
+import time
+
+# Blender's ffmpeg.constant_rate_factor presets → x264 CRF.
+CRF = {
+    "LOSSLESS": 0,
+    "PERC_LOSSLESS": 17,
+    "HIGH": 20,
+    "MEDIUM": 23,
+    "LOW": 26,
+    "VERYLOW": 29,
+    "LOWEST": 32,
+}
+# Blender's ffmpeg.ffmpeg_preset → the x264 preset its H.264 writer uses.
+X264_PRESETS = {"BEST": "slower", "GOOD": "medium", "REALTIME": "superfast"}
+# Only display-referred formats: ffmpeg cannot apply Blender's view transform to scene-linear EXR.
+FRAME_EXTENSIONS = {"PNG": "png"}
+CONTAINERS = ("mp4", "webm", "webp")
+
+
+def parse_variants(text):
+    """"256,128:webm,512:webp" → [(256, "mp4"), (128, "webm"), (512, "webp")] (width in px, container)."""
+    variants = []
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        width, _, container = item.partition(":")
+        container = (container or "mp4").lower()
+        if container not in CONTAINERS:
+            raise ValueError(f"unknown container {container!r} in {item!r} (expected {', '.join(CONTAINERS)})")
+        width = int(width)
+        # yuv420p (x264, VP9) needs even dimensions; fail here rather than after the render.
+        if width <= 0 or width % 2:
+            raise ValueError(f"width must be a positive even number of pixels, got {width} in {item!r}")
+        variants.append((width, container))
+    return variants
+
+
+def variant_path(output_path, width, container):
+    return f"{os.path.splitext(output_path)[0]}_{width}.{container}"
+
+
+def x264_args(gop=None, b_frames=None, preset=None):
+    """x264 options matching Blender's writer: keyframe interval, B-frames (None: x264's default), ffmpeg_preset."""
+    args = []
+    if gop is not None:
+        args += ["-g", str(gop)]
+    if b_frames is not None:
+        args += ["-bf", str(b_frames)]
+    if preset is not None:
+        args += ["-preset", X264_PRESETS.get(preset, preset)]
+    return args
+
+
+def codec_args(container, crf="HIGH", x264=()):
+    """ffmpeg output options for one container at a Blender CRF preset (or a raw x264 CRF).
+
+    x264 (see x264_args) is added to the mp4 options only.
+    """
+    quality = int(CRF.get(crf, crf))
+    if container == "webm":
+        # VP9's CRF scale (0-63) runs higher than x264's for similar quality.
+        return ["-c:v", "libvpx-vp9", "-crf", str(min(63, quality + 11)), "-b:v", "0", "-pix_fmt", "yuv420p", "-f", "webm"]
+    if container == "webp":
+        lossy = ["-lossless", "0", "-quality", str(100 - quality)] if quality else ["-lossless", "1"]
+        return ["-c:v", "libwebp", *lossy, "-loop", "0", "-f", "webp"]
+    return ["-c:v", "libx264", "-crf", str(quality), *x264, "-pix_fmt", "yuv420p", "-f", "mp4"]
+
+
+def frame_path(frames_dir, frame, ext="png"):
+    return os.path.join(frames_dir, f"frame_{frame:04d}.{ext}")
+
+
+def missing_frames(frames_dir, frame_count, ext="png"):
+    return [f for f in range(1, frame_count + 1) if not os.path.exists(frame_path(frames_dir, f, ext))]
+
+
+def encode_command(frames_dir, output_path, fps, ext="png", crf="HIGH", ffmpeg="ffmpeg", variants=(), x264=()):
+    """One ffmpeg run: the full-size MP4 plus each (path, width, container) variant from a single decode."""
+    cmd = [
+        ffmpeg, "-y", "-loglevel", "error", "-framerate", str(fps), "-start_number", "1",
+        "-i", os.path.join(frames_dir, f"frame_%04d.{ext}"),
+        *codec_args("mp4", crf, x264),
+        output_path,
+    ]
+    return cmd + _variant_args(variants, crf, x264)
+
+
+def _variant_args(variants, crf, x264=()):
+    args = []
+    for path, width, container in variants:
+        args += ["-vf", f"scale={width}:-2:flags=lanczos", *codec_args(container, crf, x264), path]
+    return args
+
+
+def variants_command(source, variants, fps=30, ext="png", crf="HIGH", ffmpeg="ffmpeg", x264=()):
+    """ffmpeg run writing only the variants, from a frames folder or from an already encoded video."""
+    cmd = [ffmpeg, "-y", "-loglevel", "error"]
+    if os.path.isdir(source):
+        cmd += ["-framerate", str(fps), "-start_number", "1", "-i", os.path.join(source, f"frame_%04d.{ext}")]
+    else:
+        cmd += ["-i", source]
+    return cmd + _variant_args(variants, crf, x264)
+
+
+def _partial_path(output_path):
+    return os.path.join(os.path.dirname(output_path), "." + os.path.basename(output_path) + ".partial")
+
+
+def _check_complete(frames_dir, frame_count, ext):
+    missing = missing_frames(frames_dir, frame_count, ext)
+    if missing:
+        raise RuntimeError(f"{frames_dir}: {len(missing)} frames missing (first: {missing[0]})")
+
+
+def _reap(proc):
+    """Wait for an encoder process; returns its CPU seconds (user + system) from wait4."""
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _renames(output_path, variants):
+    """(temp, final) pairs; the master output comes last, so its presence implies the variants exist."""
+    finals = [path for path, _, _ in variants] + ([output_path] if output_path else [])
+    return [(_partial_path(path), path) for path in finals]
+
+
+def _temp_variants(variants):
+    return [(_partial_path(path), width, container) for path, width, container in variants]
+
+
+def _finish(returncode, cmd, renames, frames_dir, keep_frames):
+    try:
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd)
+        for tmp_path, output_path in renames:
+            os.replace(tmp_path, output_path)
+    finally:
+        for tmp_path, _ in renames:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    if not keep_frames:
+        shutil.rmtree(frames_dir)
+
+
+def encode_sequence(
+    frames_dir,
+    output_path,
+    fps,
+    frame_count,
+    ext="png",
+    crf="HIGH",
+    ffmpeg="ffmpeg",
+    keep_frames=False,
+    variants=(),
+    x264=(),
+):
+    """Encode a complete frame sequence to output_path atomically; returns {"wall", "cpu"} seconds.
+
+    variants are (path, width, container) outputs written by the same ffmpeg run; x264 as in codec_args.
+    Raises if frames are missing or ffmpeg fails.
+    """
+    _check_complete(frames_dir, frame_count, ext)
+    cmd = encode_command(frames_dir, _partial_path(output_path), fps, ext, crf, ffmpeg, _temp_variants(variants), x264)
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd)
+    cpu = _reap(proc)
+    wall = time.perf_counter() - start
+    _finish(proc.returncode, cmd, _renames(output_path, variants), frames_dir, keep_frames)
+    return {"wall": round(wall, 4), "cpu": round(cpu, 4)}
+
+
+def encode_variants(source, variants, fps=30, ext="png", crf="HIGH", ffmpeg="ffmpeg", x264=()):
+    """Add (path, width, container) variants from source (frames folder or video), atomically; returns {"wall", "cpu"}.
+
+    source is left in place. Raises if ffmpeg fails.
+    """
+    cmd = variants_command(source, _temp_variants(variants), fps, ext, crf, ffmpeg, x264)
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd)
+    cpu = _reap(proc)
+    wall = time.perf_counter() - start
+    _finish(proc.returncode, cmd, _renames(None, variants), source, keep_frames=True)
+    return {"wall": round(wall, 4), "cpu": round(cpu, 4)}
+
+
+class EncodeQueue:
+    """Background ffmpeg encodes, at most `size` in flight; submit() blocks while the queue is full.
+
+    Lets Blender render the next object while finished sequences are encoded.
+    on_done(output_path, encode) runs once an output has been renamed into place; encode holds the
+    ffmpeg CPU seconds and the wall time until the process was reaped (an upper bound).
+    A failed encode does not raise from whichever later submit() reaps it; it is kept as
+    (output_path, exception) until take_failures().
+    """
+
+    def __init__(self, size=1, ffmpeg="ffmpeg"):
+        self.size = max(1, size)
+        self.ffmpeg = ffmpeg
+        self._running = []
+        self._failures = []
+
+    def submit(
+        self,
+        frames_dir,
+        output_path,
+        fps,
+        frame_count,
+        ext="png",
+        crf="HIGH",
+        keep_frames=False,
+        on_done=None,
+        variants=(),
+        x264=(),
+    ):
+        _check_complete(frames_dir, frame_count, ext)
+        while len(self._running) >= self.size:
+            self._wait_oldest()
+        cmd = encode_command(
+            frames_dir, _partial_path(output_path), fps, ext, crf, self.ffmpeg, _temp_variants(variants), x264
+        )
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd)
+        renames = _renames(output_path, variants)
+        self._running.append((proc, start, cmd, renames, output_path, frames_dir, keep_frames, on_done))
+
+    def _wait_oldest(self):
+        proc, start, cmd, renames, output_path, frames_dir, keep_frames, on_done = self._running.pop(0)
+        cpu = _reap(proc)
+        wall = time.perf_counter() - start
+        try:
+            _finish(proc.returncode, cmd, renames, frames_dir, keep_frames)
+        except (subprocess.CalledProcessError, OSError) as exc:
+            self._failures.append((output_path, exc))
+            return
+        if on_done is not None:
+            on_done(output_path, {"wall": round(wall, 4), "cpu": round(cpu, 4)})
+
+    def take_failures(self):
+        """(output_path, exception) for every failed encode since the last call."""
+        failures, self._failures = self._failures, []
+        return failures
+
+    def drain(self):
+        while self._running:
+            self._wait_oldest()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.drain()
+        return False
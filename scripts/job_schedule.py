@@ -0,0 +1,86 @@
+"""
+Cost-model planning for sharded renders. No bpy import — safe to use from system Python.
+Triangle counts come from the STL headers (stl_io.triangle_count); per-job wall time is fitted as
+a + b * triangles from past timings logs (stl_spin_render --timings-log), and jobs are assigned to
+workers longest-processing-time first so heavy meshes do not pile up behind one worker.
+"""
+import heapq
+import json
+import os
+
+import numpy as np
+
+from stl_io import triangle_count
+
+
+def job_seconds(record):
+    """Total wall time of one timings-log record (stages without a measurement count as 0)."""
+    return sum((stage or {}).get("wall") or 0.0 for stage in record.get("stages", {}).values())
+
+
+def load_history(paths, profile=None):
+    """(triangles, seconds) samples from timings logs, optionally only for one render profile."""
+    samples = []
+    counts = {}
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # a worker killed mid-write leaves a partial last line
+                if profile and record.get("profile") != profile:
+                    continue
+                stl_path = record.get("stl_path", "")
+                if stl_path not in counts:
+                    counts[stl_path] = triangle_count(stl_path) if os.path.exists(stl_path) else None
+                triangles = counts[stl_path] if counts[stl_path] is not None else record.get("faces")
+                if triangles is not None:
+                    samples.append((triangles, job_seconds(record)))
+    return samples
+
+
+def fit_cost_model(samples):
+    """Least-squares (a, b) for seconds = a + b * triangles, or None with fewer than two distinct sizes."""
+    if len({triangles for triangles, _ in samples}) < 2:
+        return None
+    x = np.array([triangles for triangles, _ in samples], dtype=np.float64)
+    y = np.array([seconds for _, seconds in samples], dtype=np.float64)
+    (b, a), *_ = np.linalg.lstsq(np.c_[x, np.ones_like(x)], y, rcond=None)
+    # Negative terms only come from noisy logs; no job is free or gets cheaper with more triangles.
+    return max(float(a), 0.0), max(float(b), 0.0)
+
+
+def job_costs(jobs, model=None):
+    """Estimated cost per (stl_path, output_path) job: seconds under model, else the triangle count."""
+    costs = []
+    for stl_path, _ in jobs:
+        triangles = triangle_count(stl_path) or 0
+        costs.append(model[0] + model[1] * triangles if model else float(triangles))
+    return costs
+
+
+def plan_lpt(jobs, costs, workers):
+    """Assign jobs, most expensive first, to the currently least loaded worker.
+
+    Returns (shards, loads); each shard is in descending cost order, empty shards are dropped.
+    """
+    order = sorted(range(len(jobs)), key=lambda i: (-costs[i], jobs[i]))
+    heap = [(0.0, index) for index in range(max(1, min(workers, len(jobs))))]
+    shards = [[] for _ in heap]
+    loads = [0.0 for _ in heap]
+    for i in order:
+        load, worker = heapq.heappop(heap)
+        shards[worker].append(jobs[i])
+        loads[worker] = load + costs[i]
+        heapq.heappush(heap, (loads[worker], worker))
+    kept = [index for index, shard in enumerate(shards) if shard]
+    return [shards[index] for index in kept], [loads[index] for index in kept]
+
+
+def shard_loads(shards, jobs, costs):
+    """Estimated load per shard for any assignment (e.g. stl_jobs.shard_jobs round-robin)."""
+    cost = dict(zip(jobs, costs))
+    return [sum(cost[job] for job in shard) for shard in shards]
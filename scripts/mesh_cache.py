@@ -0,0 +1,55 @@
+"""
+Cache of normalized STL geometry, keyed by the STL's content hash. No bpy import.
+
+Each entry is a compressed .npz holding welded vertices (float32, bounding box centered on the
+origin, largest side 1.0), triangle indices (int32), the original bounds and counts. Multiply the
+vertices by the target size (2.0 in stl_spin_render) to get the centered/scaled mesh.
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+
+from render_manifest import file_hash
+from stl_io import read_stl
+
+DEFAULT_CACHE_DIR = str(Path(__file__).resolve().parent.parent / ".mesh_cache")
+
+
+def normalize(vertices):
+    """Center the bounding box on the origin and scale its largest side to 1; returns (vertices, bounds)."""
+    if not len(vertices):
+        return vertices, np.zeros((2, 3), dtype=np.float32)
+    low, high = vertices.min(axis=0), vertices.max(axis=0)
+    max_dim = float((high - low).max())
+    scale_factor = 1.0 / max_dim if max_dim > 0 else 1.0
+    normalized = ((vertices - (low + high) / 2) * scale_factor).astype(np.float32)
+    return normalized, np.stack([low, high]).astype(np.float32)
+
+
+def cache_path(cache_dir, stl_hash):
+    return os.path.join(cache_dir, stl_hash[:2], stl_hash + ".npz")
+
+
+def load_normalized(stl_path, cache_dir=DEFAULT_CACHE_DIR, stl_hash=None):
+    """Normalized mesh dict (vertices, faces, bounds, vertex_count, face_count); parses the STL on a miss."""
+    stl_hash = stl_hash or file_hash(stl_path)
+    path = cache_path(cache_dir, stl_hash)
+    if os.path.exists(path):
+        with np.load(path) as data:
+            return {key: data[key] for key in data.files}
+    vertices, faces = read_stl(stl_path)
+    vertices, bounds = normalize(vertices)
+    entry = {
+        "vertices": vertices,
+        "faces": faces,
+        "bounds": bounds,
+        "vertex_count": np.int64(len(vertices)),
+        "face_count": np.int64(len(faces)),
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, **entry)
+    os.replace(tmp_path, path)
+    return entry
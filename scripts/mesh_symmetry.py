@@ -0,0 +1,105 @@
+"""
+NumPy detection of n-fold rotational symmetry about a coordinate axis, and the frame reuse it allows. No bpy import.
+A spin of `degrees` over `frames` frames shows the same image at two frames whose angles differ by a multiple
+of 360/n, so only the first frame of each such class needs rendering (frame_sources).
+"""
+import math
+from fractions import Fraction
+
+import numpy as np
+
+AXES = {"X": 0, "Y": 1, "Z": 2}
+MAX_ORDER = 64
+_NEIGHBOURS = np.array([(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)])
+
+
+def _rotate(co, axis, angle):
+    """Rotate (N, 3) points about the X, Y or Z axis (right-handed, as Blender's Euler rotation)."""
+    c, s = math.cos(angle), math.sin(angle)
+    a, b = [i for i in range(3) if i != AXES[axis]]
+    if axis == "Y":
+        a, b = b, a  # Y rotates Z towards X
+    out = co.copy()
+    out[:, a] = c * co[:, a] - s * co[:, b]
+    out[:, b] = s * co[:, a] + c * co[:, b]
+    return out
+
+
+def _grid(co, tolerance):
+    """Sorted keys of the tolerance-sized cells occupied by co, with the grid origin and shape."""
+    low = co.min(axis=0) - 2 * tolerance
+    cells = np.floor((co - low) / tolerance).astype(np.int64)
+    dims = cells.max(axis=0) + 3
+    return low, dims, np.unique(np.ravel_multi_index(cells.T, dims))
+
+
+def _all_matched(points, grid, tolerance):
+    """True if every point has an occupied cell among the 27 around it."""
+    low, dims, keys = grid
+    cells = np.floor((points - low) / tolerance).astype(np.int64)
+    found = np.zeros(len(points), dtype=bool)
+    for offset in _NEIGHBOURS:
+        candidate = cells + offset
+        inside = ((candidate >= 0) & (candidate < dims)).all(axis=1) & ~found
+        if not inside.any():
+            continue
+        index = np.ravel_multi_index(candidate[inside].T, dims)
+        slot = np.minimum(np.searchsorted(keys, index), len(keys) - 1)
+        found[np.flatnonzero(inside)[keys[slot] == index]] = True
+    return bool(found.all())
+
+
+def is_symmetric(co, axis, order, tolerance, grid=None, sample=256):
+    """True if rotating co by 360/order maps every vertex to within ~tolerance of an original vertex.
+
+    A small evenly spaced sample is checked first, so most asymmetric meshes are rejected cheaply.
+    """
+    if grid is None:
+        grid = _grid(co, tolerance)
+    angle = 2 * math.pi / order
+    step = max(len(co) // sample, 1)
+    if not _all_matched(_rotate(co[::step], axis, angle), grid, tolerance):
+        return False
+    return _all_matched(_rotate(co, axis, angle), grid, tolerance)
+
+
+def frame_sources(frames, degrees, order):
+    """Map each frame 1..frames to the first frame showing the same image under order-fold symmetry.
+
+    Frame f is at angle degrees * (f - 1) / (frames - 1); phases are compared exactly as fractions of 360/order.
+    """
+    if frames < 2:
+        return {frame: frame for frame in range(1, frames + 1)}
+    step = Fraction(degrees).limit_denominator(10**6) * max(order, 1) / (360 * (frames - 1))
+    first = {}
+    sources = {}
+    for frame in range(1, frames + 1):
+        phase = step * (frame - 1)
+        phase -= math.floor(phase)
+        sources[frame] = first.setdefault(phase, frame)
+    return sources
+
+
+def unique_frames(sources):
+    return sum(1 for frame, source in sources.items() if frame == source)
+
+
+def symmetry_order(co, axis="Z", tolerance=1e-3, frames=None, degrees=360, max_order=MAX_ORDER):
+    """Largest n <= max_order for which co has n-fold symmetry about axis (1 if none).
+
+    With frames given, only orders that would reuse more frames than n=1 are tested, best saving first, so
+    an animation whose frame step never lines up with 360/n does not pay for the check.
+    """
+    co = np.asarray(co, dtype=np.float64)
+    if len(co) == 0 or tolerance <= 0:
+        return 1
+    orders = range(max_order, 1, -1)
+    if frames is not None:
+        baseline = unique_frames(frame_sources(frames, degrees, 1))
+        saving = {n: baseline - unique_frames(frame_sources(frames, degrees, n)) for n in orders}
+        orders = sorted((n for n in orders if saving[n] > 0), key=lambda n: (-saving[n], -n))
+    grid = _grid(co, tolerance)
+    for order in orders:
+        if is_symmetric(co, axis, order, tolerance, grid):
+            return order
+    return 1
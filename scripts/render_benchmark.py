@@ -0,0 +1,210 @@
+"""
+Reproducible benchmark for the STL → MP4 pipeline (system Python; runs Blender via render_worker.py).
+
+Renders a fixed corpus of checked-in STLs under the pinned "draft" profile, reports frames/sec,
+per-stage timings and output sizes, and compares them with a stored baseline.
+
+  python scripts/render_benchmark.py                      # compare with the baseline (10% and 50 ms threshold)
+  python scripts/render_benchmark.py --threshold 0.2
+  python scripts/render_benchmark.py --update-baseline    # record this machine's numbers
+  python scripts/render_benchmark.py -- --persistent-data # extra stl_spin_render options after "--"
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from render_launcher import default_blender
+from stl_jobs import write_jobs_file
+
+_SCRIPTS = Path(__file__).resolve().parent
+_PROJECT = _SCRIPTS.parent
+BASELINE = _SCRIPTS / "render_benchmark_baseline.json"
+PROFILE = "draft"
+MIN_DELTA = 0.05  # seconds; smaller changes in a timing are scheduler jitter, not regressions
+# Small generated meshes, a median ALICE shape (~18k triangles) and ALICE 26 (~83k) as the high-poly stress case.
+CORPUS = [
+    "stl_files_test/shape_generator_object_94.stl",
+    "stl_files_test/shape_generator_object_1.stl",
+    "stl_files_test/shape_generator_object_56.stl",
+    "data/ALICE_stl_(Xu & Sandhofer, 2024)/20.stl",
+    "data/ALICE_stl_(Xu & Sandhofer, 2024)/26.stl",
+]
+
+
+def blender_version(blender):
+    out = subprocess.run([blender, "--version"], capture_output=True, text=True).stdout
+    return out.splitlines()[0] if out else "unknown"
+
+
+def run_corpus(blender, work_dir, threads=0, extra_args=()):
+    """Render CORPUS once; returns the timings records (one per STL)."""
+    out_dir = os.path.join(work_dir, "out")
+    jobs = [
+        (str(_PROJECT / rel), os.path.join(out_dir, f"{i:02d}_{Path(rel).stem}.mp4"))
+        for i, rel in enumerate(CORPUS)
+    ]
+    jobs_file = os.path.join(work_dir, "jobs.json")
+    timings_log = os.path.join(work_dir, "timings.jsonl")
+    write_jobs_file(jobs_file, jobs)
+    cmd = [
+        blender, "-b", "--python-exit-code", "1", "-P", str(_SCRIPTS / "render_worker.py"), "--",
+        "--input", str(_PROJECT),
+        "--output", out_dir,
+        "--jobs-file", jobs_file,
+        "--profile", PROFILE,
+        "--force",
+        "--timings-log", timings_log,
+        # A cache of its own, empty every run: a warm repo-level .mesh_cache/ would speed up import.
+        "--mesh-cache", os.path.join(work_dir, "mesh_cache"),
+        "--threads", str(threads),
+        *extra_args,
+    ]
+    with open(os.path.join(work_dir, "blender.log"), "w") as log:
+        subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT, check=True)
+    with open(timings_log) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(records):
+    """Collapse timings records into the metrics that are compared against the baseline.
+
+    Records are matched to CORPUS by STL path; entries without one (failed jobs) are listed under "missing".
+    """
+    by_path = {record["stl_path"]: record for record in records}
+    objects = {}
+    missing = []
+    stage_totals = {}
+    total_frames = 0
+    render_wall = 0.0
+    for rel in CORPUS:
+        record = by_path.get(os.path.abspath(_PROJECT / rel))
+        if record is None:
+            missing.append(rel)
+            continue
+        stages = {name: t["wall"] for name, t in record["stages"].items() if t}
+        for name, wall in stages.items():
+            stage_totals[name] = stage_totals.get(name, 0.0) + wall
+        n_frames = len(record.get("frames", []))
+        total_frames += n_frames
+        render_wall += stages.get("render", 0.0)
+        objects[rel] = {
+            "faces": record.get("faces"),
+            "wall": round(sum(stages.values()), 4),
+            "fps": round(n_frames / stages["render"], 3) if stages.get("render") else None,
+            "stages": stages,
+            "output_bytes": os.path.getsize(record["output_path"]),
+        }
+    return {
+        "total_wall": round(sum(stage_totals.values()), 4),
+        "fps": round(total_frames / render_wall, 3) if render_wall else None,
+        "stages": {name: round(wall, 4) for name, wall in stage_totals.items()},
+        "objects": objects,
+        "missing": missing,
+    }
+
+
+def compare(current, baseline, threshold, min_delta=MIN_DELTA):
+    """Return (metric, baseline, current, change) for every metric worse than threshold.
+
+    Timings (seconds) that moved by less than min_delta are never regressions, whatever the relative change.
+    """
+    checks = [("total_wall", baseline["total_wall"], current["total_wall"], False)]
+    checks.append(("fps", baseline["fps"], current["fps"], True))
+    for name, wall in baseline["stages"].items():
+        checks.append((f"stage {name}", wall, current["stages"].get(name, 0.0), False))
+    for rel, obj in baseline["objects"].items():
+        if rel in current["objects"]:
+            checks.append((f"{rel} wall", obj["wall"], current["objects"][rel]["wall"], False))
+    regressions = []
+    for metric, old, new, higher_is_better in checks:
+        if not old or new is None:
+            continue
+        if not higher_is_better and abs(new - old) < min_delta:
+            continue
+        change = (new - old) / old
+        if (-change if higher_is_better else change) > threshold:
+            regressions.append((metric, old, new, change))
+    return regressions
+
+
+def print_report(summary):
+    print(f"{'object':<58}{'faces':>8}{'fps':>8}{'wall s':>9}{'bytes':>10}")
+    for rel, obj in summary["objects"].items():
+        print(f"{rel:<58}{obj['faces'] or 0:>8}{obj['fps'] or 0:>8.2f}{obj['wall']:>9.2f}{obj['output_bytes']:>10}")
+    print("stages: " + ", ".join(f"{name} {wall:.2f}s" for name, wall in summary["stages"].items()))
+    print(f"total {summary['total_wall']:.2f}s, {summary['fps']} frames/s")
+    for rel in summary["missing"]:
+        print(f"❌ {rel}: no timings record, the job failed (--keep leaves blender.log and out_failures.jsonl)")
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    extra_args = []
+    if "--" in argv:
+        extra_args = argv[argv.index("--") + 1:]
+        argv = argv[:argv.index("--")]
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--blender", help="Blender executable (default: bundled blender-4.5.0-linux-x64)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before failing (0.10 = 10%%)")
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=MIN_DELTA,
+        help="ignore timing changes smaller than this many seconds (default: %(default)s)",
+    )
+    parser.add_argument("--threads", type=int, default=0, help="Cycles threads (0 = all cores)")
+    parser.add_argument("--baseline", default=str(BASELINE))
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--keep", action="store_true", help="keep the work directory (renders, logs)")
+    args = parser.parse_args(argv)
+    blender = args.blender or default_blender()
+
+    work_dir = tempfile.mkdtemp(prefix="stl_render_bench_")
+    records = run_corpus(blender, work_dir, args.threads, extra_args)
+    summary = summarize(records)
+    summary["env"] = {
+        "blender": blender_version(blender),
+        "machine": platform.node(),
+        "cpu_count": os.cpu_count(),
+        "profile": PROFILE,
+        "extra_args": extra_args,
+    }
+    print_report(summary)
+    if not args.keep:
+        shutil.rmtree(work_dir)
+    else:
+        print(f"Work directory: {work_dir}")
+
+    if summary["missing"]:
+        print(f"❌ {len(summary['missing'])} of {len(CORPUS)} corpus objects did not render; not comparing")
+        return 1
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(summary, f, indent=1)
+        print(f"✅ Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("No baseline yet; run with --update-baseline")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("env", {}).get("machine") != summary["env"]["machine"]:
+        print(f"⚠️  Baseline was recorded on {baseline.get('env', {}).get('machine')}, timings may not be comparable")
+    regressions = compare(summary, baseline, args.threshold, args.min_delta)
+    for metric, old, new, change in regressions:
+        print(f"❌ {metric}: {old:.3f} → {new:.3f} ({change:+.0%})")
+    if regressions:
+        return 1
+    print(f"✅ No regressions beyond {args.threshold:.0%} (and {args.min_delta:g}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""
+Plain-Python launcher: list STL jobs, split them into N shards and run one headless
+Blender worker (render_worker.py) per shard, each with its own Cycles thread budget.
+
+  python scripts/render_launcher.py data/abstract-25/stl data/abstract-25/animations --workers 4
+  python scripts/render_launcher.py IN OUT --workers 8 -- --template
+
+Anything after "--" is forwarded to every worker (stl_spin_render options).
+
+By default jobs are balanced longest-processing-time first on a cost model fitted from the output folder's
+timings log (--schedule round-robin restores plain round-robin sharding).
+
+Workers are supervised: a job running past --job-timeout, or a worker that crashes, is written to the
+failures log (OUTPUT_failures.jsonl) and the worker is restarted on the rest of its shard. Jobs that reached
+the timings or failures log since the launch are not repeated on restart, even with a forwarded --force.
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from job_schedule import fit_cost_model, job_costs, load_history, plan_lpt, shard_loads
+from stl_jobs import (
+    filter_jobs,
+    list_jobs,
+    log_size,
+    logged_outputs,
+    read_allow_list,
+    read_progress,
+    record_failure,
+    shard_jobs,
+    write_jobs_file,
+)
+
+_SCRIPTS = Path(__file__).resolve().parent
+_PROJECT = _SCRIPTS.parent
+_BUNDLED_BLENDER = _PROJECT / "blender-4.5.0-linux-x64" / "blender"
+
+
+def default_blender():
+    return str(_BUNDLED_BLENDER) if _BUNDLED_BLENDER.exists() else "blender"
+
+
+def worker_command(blender, input_folder, output_folder, jobs_file, threads, extra_args, progress_file=None):
+    return [
+        blender, "-b", "--python-exit-code", "1", "-P", str(_SCRIPTS / "render_worker.py"), "--",
+        "--input", input_folder,
+        "--output", output_folder,
+        "--jobs-file", jobs_file,
+        "--threads", str(threads),
+        *(["--progress", progress_file] if progress_file else []),
+        *extra_args,
+    ]
+
+
+class Worker:
+    """One Blender process rendering a shard; restarted on the jobs it has neither finished nor given up on.
+
+    logs are (path, offset) pairs of the JSON-lines logs a finished job appears in, read from offset on.
+    """
+
+    def __init__(self, index, shard, work_dir, command, logs=()):
+        self.index = index
+        self.shard = list(shard)
+        self.logs = list(logs)
+        self.abandoned = set()
+        self.restarts = 0
+        self.jobs_file = os.path.join(work_dir, f"shard_{index}.json")
+        self.progress_file = os.path.join(work_dir, f"worker_{index}.progress.json")
+        self.log_path = os.path.join(work_dir, f"worker_{index}.log")
+        self.command = command
+        self.proc = None
+        self.log = None
+
+    def remaining(self):
+        finished = set().union(*(logged_outputs(path, offset) for path, offset in self.logs))
+        return [
+            job for job in self.shard
+            if job[0] not in self.abandoned and os.path.abspath(job[1]) not in finished
+        ]
+
+    def start(self):
+        write_jobs_file(self.jobs_file, self.remaining())
+        if os.path.exists(self.progress_file):
+            os.remove(self.progress_file)
+        self.log = open(self.log_path, "a")
+        # Own process group, so a kill also takes down any ffmpeg encoders the worker started.
+        self.proc = subprocess.Popen(
+            self.command(self.jobs_file, self.progress_file),
+            stdout=self.log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    def kill(self):
+        try:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        self.proc.wait()
+
+    def close(self):
+        self.log.close()
+
+
+def supervise(workers, failures_log, job_timeout=0, max_restarts=2, poll=1.0):
+    """Wait for all workers, killing jobs over job_timeout seconds and restarting crashed workers.
+
+    The job a dead worker was on is logged to failures_log and skipped on restart. A worker that dies
+    outside any job is restarted at most max_restarts times. Returns the indices of workers given up on.
+    """
+    for worker in workers:
+        worker.start()
+    running = list(workers)
+    failed = []
+    while running:
+        time.sleep(poll)
+        for worker in list(running):
+            code = worker.proc.poll()
+            progress = read_progress(worker.progress_file) or {}
+            current = progress.get("stl_path")
+            if code is None:
+                if not (job_timeout and current and time.time() - progress["started"] > job_timeout):
+                    continue
+                worker.kill()
+                reason = f"timed out after {job_timeout:g}s"
+            elif code == 0:
+                worker.close()
+                running.remove(worker)
+                continue
+            else:
+                reason = f"worker exited with {code}"
+            worker.close()
+            if current:
+                record_failure(failures_log, current, progress["output_path"], reason, worker=worker.index)
+                worker.abandoned.add(current)
+                print(f"❌ Worker {worker.index}: {current} {reason}; restarting on the remaining jobs")
+                worker.start()
+            elif worker.restarts < max_restarts:
+                worker.restarts += 1
+                print(f"❌ Worker {worker.index}: {reason} between jobs; restart {worker.restarts}/{max_restarts}")
+                worker.start()
+            else:
+                failed.append(worker.index)
+                running.remove(worker)
+                print(f"❌ Worker {worker.index}: {reason}, giving up, see worker_{worker.index}.log")
+    return failed
+
+
+def _forwarded_option(extra_args, name, default=None):
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument(name, default=default)
+    return vars(parser.parse_known_args(list(extra_args))[0])[name.lstrip("-").replace("-", "_")]
+
+
+def plan_shards(jobs, workers, schedule="lpt", history=(), profile=None):
+    """Split jobs over workers and print the estimated makespan; returns the shards."""
+    samples = load_history(history, profile)
+    model = fit_cost_model(samples)
+    costs = job_costs(jobs, model)
+    round_robin = shard_jobs(jobs, max(1, workers))
+    if model:
+        unit = "s"
+        print(f"Cost model from {len(samples)} logged jobs: {model[0]:.2f}s + {model[1] * 1e6:.1f}s per 1M triangles")
+    else:
+        unit = " triangles"
+        print("No usable timings history; balancing by triangle count")
+    if schedule == "lpt":
+        shards, loads = plan_lpt(jobs, costs, workers)
+    else:
+        shards, loads = round_robin, shard_loads(round_robin, jobs, costs)
+    if loads:
+        baseline = max(shard_loads(round_robin, jobs, costs))
+        print(
+            f"Planned makespan ({schedule}): {max(loads):.1f}{unit} "
+            f"(lightest worker {min(loads):.1f}{unit}; round-robin {baseline:.1f}{unit})"
+        )
+    return shards
+
+
+def launch(
+    input_folder,
+    output_folder,
+    workers,
+    blender=None,
+    threads=0,
+    extra_args=(),
+    work_dir=None,
+    schedule="lpt",
+    history=None,
+    job_timeout=0,
+    max_restarts=2,
+):
+    """Render every STL under input_folder with `workers` Blender processes; returns failed shard indices.
+
+    history lists timings logs for the cost model (default: the log the workers append to).
+    job_timeout (seconds, 0 = none) is the wall-clock budget of a single job.
+    """
+    blender = blender or default_blender()
+    input_folder = os.path.abspath(input_folder)
+    output_folder = os.path.abspath(output_folder)
+    jobs = list_jobs(input_folder, output_folder)
+    allow_list = _forwarded_option(extra_args, "--allow-list")
+    if allow_list:
+        jobs = filter_jobs(jobs, read_allow_list(allow_list))
+    timings_log = _forwarded_option(extra_args, "--timings-log") or output_folder + "_timings.jsonl"
+    if history is None:
+        history = [timings_log]
+    profile = _forwarded_option(extra_args, "--profile", "final")
+    shards = plan_shards(jobs, workers, schedule, history, profile)
+    if not shards:
+        print(f"No STL files under {input_folder}")
+        return []
+    if threads <= 0:
+        threads = max(1, (os.cpu_count() or 1) // len(shards))
+    work_dir = work_dir or tempfile.mkdtemp(prefix="stl_render_shards_")
+    os.makedirs(output_folder, exist_ok=True)
+    print(f"{len(jobs)} jobs → {len(shards)} workers × {threads} threads (logs in {work_dir})")
+    failures_log = _forwarded_option(extra_args, "--failures-log") or output_folder + "_failures.jsonl"
+    start = time.perf_counter()
+
+    def command(jobs_file, progress_file):
+        return worker_command(blender, input_folder, output_folder, jobs_file, threads, extra_args, progress_file)
+
+    # Records from before this launch are not finished work of this one.
+    logs = [(path, log_size(path)) for path in (timings_log, failures_log)]
+    workers = [Worker(index, shard, work_dir, command, logs) for index, shard in enumerate(shards)]
+    failed = supervise(workers, failures_log, job_timeout, max_restarts)
+    print(f"✅ {len(jobs)} jobs in {time.perf_counter() - start:.1f}s wall clock")
+    if os.path.exists(failures_log):
+        print(f"Failed jobs are listed in {failures_log}")
+    return failed
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    extra_args = []
+    if "--" in argv:
+        extra_args = argv[argv.index("--") + 1:]
+        argv = argv[:argv.index("--")]
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input_folder")
+    parser.add_argument("output_folder")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threads", type=int, default=0, help="Cycles threads per worker (default: cores / workers)")
+    parser.add_argument("--blender", help="Blender executable (default: bundled blender-4.5.0-linux-x64)")
+    parser.add_argument("--work-dir", help="where shard job lists and worker logs go (default: a temp dir)")
+    parser.add_argument(
+        "--schedule",
+        choices=("lpt", "round-robin"),
+        default="lpt",
+        help="lpt: balance estimated cost, longest jobs first (default); round-robin: sorted path order",
+    )
+    parser.add_argument(
+        "--history",
+        action="append",
+        help="timings log(s) to fit the cost model on (default: OUTPUT_timings.jsonl or the forwarded --timings-log)",
+    )
+    parser.add_argument(
+        "--job-timeout",
+        type=float,
+        default=0,
+        help="kill a worker whose current job runs longer than this many seconds and restart it (0 = no limit)",
+    )
+    parser.add_argument(
+        "--max-restarts",
+        type=int,
+        default=2,
+        help="restarts per worker for crashes outside a job (crashes inside a job always skip it and restart)",
+    )
+    args = parser.parse_args(argv)
+    failed = launch(
+        args.input_folder,
+        args.output_folder,
+        args.workers,
+        blender=args.blender,
+        threads=args.threads,
+        extra_args=extra_args,
+        work_dir=args.work_dir,
+        schedule=args.schedule,
+        history=args.history,
+        job_timeout=args.job_timeout,
+        max_restarts=args.max_restarts,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
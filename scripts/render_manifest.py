@@ -0,0 +1,72 @@
+"""
+Render manifest: maps each output (relative to the manifest) to the hash of its STL bytes and
+of the effective render settings, so re-runs only render new or changed inputs. No bpy import.
+The manifest lives next to the output folder: animations/ → animations_manifest.json.
+"""
+import fcntl
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+
+
+def manifest_path(output_folder):
+    return os.path.normpath(os.path.abspath(output_folder)) + "_manifest.json"
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def settings_hash(settings):
+    encoded = json.dumps(settings, sort_keys=True, default=list).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _key(path, output_path):
+    return os.path.relpath(os.path.abspath(output_path), os.path.dirname(path))
+
+
+def is_current(manifest, path, output_path, stl_hash, settings_digest):
+    """True if output_path exists and was rendered from the same STL bytes and settings."""
+    entry = manifest.get(_key(path, output_path))
+    return (
+        entry is not None
+        and os.path.exists(output_path)
+        and entry.get("stl_hash") == stl_hash
+        and entry.get("settings_hash") == settings_digest
+    )
+
+
+@contextmanager
+def _locked(path):
+    # Sharded workers share one manifest; serialize read-modify-write cycles.
+    with open(path + ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def record_output(path, output_path, entry):
+    """Store entry for output_path, re-reading the manifest under a lock and replacing it atomically."""
+    with _locked(path):
+        manifest = load_manifest(path)
+        manifest[_key(path, output_path)] = entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    return manifest
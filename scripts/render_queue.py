@@ -0,0 +1,244 @@
+"""
+File-based job queue between plain-Python clients and resident Blender render workers. No bpy import.
+
+Layout under the queue directory: pending/, running/, done/, failed/ holding one <job id>.json each.
+Jobs move between folders with os.rename, so several workers can share a queue safely.
+A job whose worker process died is put back in pending/ (once) or marked failed by recover(),
+which workers and waiting clients run as they poll.
+
+  ./blender-4.5.0-linux-x64/blender -b -P scripts/render_worker.py -- --serve /tmp/render_queue
+  python scripts/render_queue.py submit /tmp/render_queue some.stl out/some.mp4 --profile draft --wait
+  python scripts/render_queue.py status /tmp/render_queue
+  python scripts/render_queue.py stop /tmp/render_queue
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+import uuid
+
+STATES = ("pending", "running", "done", "failed")
+MAX_ATTEMPTS = 2
+
+
+def _ensure(queue_dir):
+    for state in STATES:
+        os.makedirs(os.path.join(queue_dir, state), exist_ok=True)
+
+
+def _job_path(queue_dir, state, job_id):
+    return os.path.join(queue_dir, state, job_id + ".json")
+
+
+def _write(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def submit(queue_dir, stl_path, output_path, profile="final", output_folder=None, force=False):
+    """Queue one STL; returns the job id. output_folder is the root the manifest/timings live next to."""
+    _ensure(queue_dir)
+    # Time-ordered ids keep pending/ in submission order.
+    job_id = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+    job = {
+        "id": job_id,
+        "stl_path": os.path.abspath(stl_path),
+        "output_path": os.path.abspath(output_path),
+        "output_folder": os.path.abspath(output_folder) if output_folder else None,
+        "profile": profile,
+        "force": force,
+        "submitted": time.time(),
+    }
+    # Written outside pending/ first so workers never see a half-written job.
+    tmp_path = os.path.join(queue_dir, job_id + ".json")
+    _write(tmp_path, job)
+    os.rename(tmp_path, _job_path(queue_dir, "pending", job_id))
+    return job_id
+
+
+def wait(queue_dir, job_id, timeout=None, poll=0.2):
+    """Block until the job is done (returns its record) or failed (raises RuntimeError)."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        for state in ("done", "failed"):
+            path = _job_path(queue_dir, state, job_id)
+            if os.path.exists(path):
+                with open(path) as f:
+                    job = json.load(f)
+                if state == "failed":
+                    raise RuntimeError(f"Job {job_id} failed: {job.get('error')}")
+                return job
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError(f"Job {job_id} not finished after {timeout}s")
+        recover(queue_dir)
+        time.sleep(poll)
+
+
+def claim(queue_dir):
+    """Move the oldest pending job to running/ and return it, or None if the queue is empty."""
+    pending = os.path.join(queue_dir, "pending")
+    for name in sorted(os.listdir(pending)):
+        if not name.endswith(".json"):
+            continue
+        job_id = name[: -len(".json")]
+        running_path = _job_path(queue_dir, "running", job_id)
+        try:
+            os.rename(os.path.join(pending, name), running_path)
+        except FileNotFoundError:
+            continue  # another worker got it first
+        with open(running_path) as f:
+            job = json.load(f)
+        job["started"] = time.time()
+        job["worker_pid"] = os.getpid()
+        job["worker_host"] = socket.gethostname()
+        _write(running_path, job)
+        return job
+    return None
+
+
+def _worker_alive(job):
+    """False only if the claiming worker ran on this host and its process is gone."""
+    if job.get("worker_host") != socket.gethostname() or not job.get("worker_pid"):
+        return True
+    try:
+        os.kill(job["worker_pid"], 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def recover(queue_dir, max_attempts=MAX_ATTEMPTS):
+    """Requeue running jobs whose worker died, or fail them after max_attempts tries; returns the job ids."""
+    running = os.path.join(queue_dir, "running")
+    recovered = []
+    for name in sorted(os.listdir(running)):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(running, name)
+        try:
+            with open(path) as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            continue  # finished or being rewritten meanwhile
+        if _worker_alive(job):
+            continue
+        # Whoever renames it first recovers it; finish() or another recover() then sees it gone.
+        recovering = os.path.join(queue_dir, name + ".recovering")
+        try:
+            os.rename(path, recovering)
+        except FileNotFoundError:
+            continue
+        attempts = job.get("attempts", 0) + 1
+        error = f"worker {job['worker_pid']} on {job['worker_host']} died during the job"
+        job = {key: value for key, value in job.items() if key not in ("started", "worker_pid", "worker_host")}
+        job["attempts"] = attempts
+        if attempts < max_attempts:
+            _write(recovering, job)
+            os.rename(recovering, _job_path(queue_dir, "pending", job["id"]))
+        else:
+            _write(_job_path(queue_dir, "failed", job["id"]), {**job, "error": error, "finished": time.time()})
+            os.remove(recovering)
+        recovered.append(job["id"])
+    return recovered
+
+
+def finish(queue_dir, job, state, **fields):
+    """Record a claimed job as done or failed."""
+    job = {**job, **fields, "finished": time.time()}
+    _write(_job_path(queue_dir, state, job["id"]), job)
+    os.remove(_job_path(queue_dir, "running", job["id"]))
+    return job
+
+
+def stop_requested(queue_dir):
+    return os.path.exists(os.path.join(queue_dir, "stop"))
+
+
+def serve(queue_dir, handler, poll=0.5, idle_exit=None):
+    """Run handler(job) -> dict for each claimed job until `stop` appears or idle_exit seconds pass idle."""
+    _ensure(queue_dir)
+    if stop_requested(queue_dir):
+        os.remove(os.path.join(queue_dir, "stop"))  # left over from a previous stop
+    idle_since = time.monotonic()
+    while not stop_requested(queue_dir):
+        recover(queue_dir)
+        job = claim(queue_dir)
+        if job is None:
+            if idle_exit is not None and time.monotonic() - idle_since > idle_exit:
+                break
+            time.sleep(poll)
+            continue
+        try:
+            result = handler(job) or {}
+        except Exception as exc:
+            finish(queue_dir, job, "failed", error=f"{type(exc).__name__}: {exc}")
+        else:
+            finish(queue_dir, job, "done", **result)
+        idle_since = time.monotonic()
+
+
+def status(queue_dir):
+    _ensure(queue_dir)
+    return {state: len([n for n in os.listdir(os.path.join(queue_dir, state)) if n.endswith(".json")]) for state in STATES}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    p = commands.add_parser("submit")
+    p.add_argument("queue_dir")
+    p.add_argument("stl_path")
+    p.add_argument("output_path")
+    p.add_argument("--profile", default="final")
+    p.add_argument("--output-folder", help="folder whose manifest/timings log the job updates")
+    p.add_argument("--force", action="store_true")
+    p.add_argument("--wait", action="store_true")
+    p.add_argument("--timeout", type=float, help="with --wait: give up after this many seconds")
+    p = commands.add_parser("wait")
+    p.add_argument("queue_dir")
+    p.add_argument("job_id")
+    p.add_argument("--timeout", type=float)
+    p = commands.add_parser("status")
+    p.add_argument("queue_dir")
+    p = commands.add_parser("stop")
+    p.add_argument("queue_dir")
+    p = commands.add_parser("recover")
+    p.add_argument("queue_dir")
+    args = parser.parse_args(argv)
+
+    if args.command == "submit":
+        job_id = submit(args.queue_dir, args.stl_path, args.output_path, args.profile, args.output_folder, args.force)
+        print(job_id)
+        if args.wait:
+            try:
+                job = wait(args.queue_dir, job_id, args.timeout)
+            except (RuntimeError, TimeoutError) as exc:
+                print(f"❌ {exc}")
+                return 1
+            print(f"✅ {job['output_path']} ({job['finished'] - job['submitted']:.1f}s)")
+    elif args.command == "wait":
+        try:
+            job = wait(args.queue_dir, args.job_id, args.timeout)
+        except (RuntimeError, TimeoutError) as exc:
+            print(f"❌ {exc}")
+            return 1
+        print(f"✅ {job['output_path']}")
+    elif args.command == "status":
+        print(" ".join(f"{state}={count}" for state, count in status(args.queue_dir).items()))
+    elif args.command == "stop":
+        open(os.path.join(args.queue_dir, "stop"), "w").close()
+    elif args.command == "recover":
+        _ensure(args.queue_dir)
+        for job_id in recover(args.queue_dir):
+            print(f"Recovered {job_id}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,16 @@
+"""Headless Blender worker: renders --input/--output (or only a --jobs-file shard, for render_launcher.py),
+or with --serve QUEUE_DIR stays resident and renders jobs submitted with render_queue.py."""
+import sys
+from pathlib import Path
+
+_scripts = Path(__file__).resolve().parent
+if str(_scripts) not in sys.path:
+    sys.path.insert(0, str(_scripts))
+
+from stl_spin_render import main, parse_args
+
+# ./blender-4.5.0-linux-x64/blender -b -P scripts/render_worker.py -- --input IN --output OUT [--jobs-file shard.json]
+# ./blender-4.5.0-linux-x64/blender -b -P scripts/render_worker.py -- --serve /tmp/render_queue [--template]
+
+_args = parse_args()
+main(_args.input, _args.output, _args)
@@ -0,0 +1,70 @@
+"""
+NumPy STL reading (binary via memory map, ASCII via regex) and vertex welding. No bpy import.
+Binary layout: 80-byte header, uint32 triangle count, then 50-byte records (normal, 3 vertices, attribute).
+"""
+import os
+import re
+
+import numpy as np
+
+HEADER_SIZE = 84
+RECORD_DTYPE = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attr", "<u2")])
+_ASCII_VERTEX = re.compile(rb"vertex\s+(\S+)\s+(\S+)\s+(\S+)")
+
+
+def declared_count(path):
+    """Triangle count from a binary header, or None if the file is too short to have one."""
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        return None
+    return int(np.frombuffer(header, "<u4", count=1, offset=80)[0])
+
+
+def is_binary(path):
+    """Binary if the size matches the declared count; otherwise ASCII if it starts with "solid"."""
+    size = os.path.getsize(path)
+    count = declared_count(path)
+    if count is not None and size == HEADER_SIZE + count * RECORD_DTYPE.itemsize:
+        return True
+    with open(path, "rb") as f:
+        return not f.read(5).lower().startswith(b"solid")
+
+
+def triangle_count(path):
+    """Cheap triangle count: header for binary files, "facet" keywords for ASCII."""
+    if is_binary(path):
+        return declared_count(path)
+    with open(path, "rb") as f:
+        return f.read().count(b"facet normal")
+
+
+def read_triangles(path):
+    """(n, 3, 3) float32 triangle corners; binary files are memory-mapped, not copied."""
+    if is_binary(path):
+        count = declared_count(path)
+        if count == 0:
+            return np.empty((0, 3, 3), dtype=np.float32)
+        records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+        return records["vertices"]
+    with open(path, "rb") as f:
+        coords = _ASCII_VERTEX.findall(f.read())
+    return np.array(coords, dtype=np.float32).reshape(-1, 3, 3)
+
+
+def weld(triangles):
+    """Merge identical corners: returns (vertices (m, 3) float32, faces (k, 3) int32).
+
+    Triangles that collapse to fewer than three distinct vertices are dropped.
+    """
+    corners = np.ascontiguousarray(triangles, dtype=np.float32).reshape(-1, 3) + np.float32(0.0)  # -0.0 → 0.0
+    keys = corners.view(np.dtype((np.void, corners.dtype.itemsize * 3))).ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    faces = inverse.reshape(-1, 3).astype(np.int32)
+    valid = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])
+    return corners[first], faces[valid]
+
+
+def read_stl(path):
+    """Welded (vertices, faces) arrays for a binary or ASCII STL."""
+    return weld(read_triangles(path))
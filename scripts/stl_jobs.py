@@ -0,0 +1,111 @@
+"""
+STL job listing shared by the Blender pipeline (stl_spin_render.py) and plain-Python tools.
+No bpy import — safe to use from system Python.
+"""
+import json
+import os
+import time
+
+
+def iter_jobs(input_folder, output_folder):
+    """Yield (stl_path, output_path) for every .stl under input_folder, mirrored under output_folder."""
+    for root, dirs, files in os.walk(input_folder):
+        for filename in files:
+            if not filename.lower().endswith(".stl"):
+                continue
+            stl_path = os.path.join(root, filename)
+            rel_dir = os.path.relpath(root, input_folder)
+            if rel_dir in (os.curdir, ".", ""):
+                output_subfolder = output_folder
+            else:
+                output_subfolder = os.path.join(output_folder, rel_dir)
+            base_name = os.path.splitext(filename)[0]
+            yield stl_path, os.path.join(output_subfolder, base_name + ".mp4")
+
+
+def list_jobs(input_folder, output_folder):
+    input_folder = os.path.abspath(input_folder)
+    output_folder = os.path.abspath(output_folder)
+    return sorted(iter_jobs(input_folder, output_folder))
+
+
+def shard_jobs(jobs, shard_count):
+    """Split jobs round-robin into shard_count lists (empty shards are dropped)."""
+    shards = [jobs[i::shard_count] for i in range(shard_count)]
+    return [shard for shard in shards if shard]
+
+
+def read_allow_list(path):
+    """Absolute STL paths from an allow-list (one per line, as written by stl_validate.py)."""
+    with open(path) as f:
+        return {os.path.abspath(line.strip()) for line in f if line.strip()}
+
+
+def filter_jobs(jobs, allowed):
+    """Keep only jobs whose STL is in allowed; prints how many were left out."""
+    jobs = list(jobs)
+    kept = [job for job in jobs if os.path.abspath(job[0]) in allowed]
+    if len(kept) < len(jobs):
+        print(f"Allow-list: skipping {len(jobs) - len(kept)} of {len(jobs)} STLs")
+    return kept
+
+
+def write_jobs_file(path, jobs):
+    with open(path, "w") as f:
+        json.dump([list(job) for job in jobs], f, indent=1)
+
+
+def read_jobs_file(path):
+    with open(path) as f:
+        return [tuple(job) for job in json.load(f)]
+
+
+def write_progress(path, stl_path=None, output_path=None):
+    """Atomically record the job a worker is on (None between jobs) for the launcher's watchdog."""
+    if not path:
+        return
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"pid": os.getpid(), "stl_path": stl_path, "output_path": output_path, "started": time.time()}, f)
+    os.replace(tmp_path, path)
+
+
+def read_progress(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def log_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def logged_outputs(path, offset=0):
+    """Absolute output paths of the records appended to a JSON-lines timings or failures log after offset bytes."""
+    if not os.path.exists(path):
+        return set()
+    outputs = set()
+    with open(path) as f:
+        f.seek(offset)
+        for line in f:
+            try:
+                outputs.add(os.path.abspath(json.loads(line)["output_path"]))
+            except (ValueError, KeyError):
+                continue  # a worker killed mid-write leaves a partial last line
+    return outputs
+
+
+def record_failure(path, stl_path, output_path, error, trace=None, **fields):
+    """Append one failed job (error summary, optional traceback) to a JSON-lines failures log."""
+    record = {
+        "stl_path": os.path.abspath(stl_path),
+        "output_path": os.path.abspath(output_path),
+        "error": error,
+        "traceback": trace,
+        "time": time.time(),
+        **fields,
+    }
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
@@ -0,0 +1,213 @@
+"""
+Pack a tree of small STLs (plus their JSON sidecars) into one indexed, memory-mapped archive.
+
+Layout: b"STLPACK1", uint64 index length, UTF-8 JSON index, zero padding to 64 bytes, then the
+float32 triangle data of every STL back to back ((n, 3, 3) per entry). Index entries hold the
+relative name, byte offset into the data section, triangle count and SHA-256 of the source file.
+
+  python scripts/stl_pack.py pack stl_parameters stl_parameters.stlpack
+  python scripts/stl_pack.py verify stl_parameters.stlpack stl_parameters
+  python scripts/stl_pack.py unpack stl_parameters.stlpack /tmp/unpacked
+  python scripts/stl_pack.py bench stl_parameters.stlpack stl_parameters
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+from render_manifest import file_hash
+from stl_io import HEADER_SIZE, RECORD_DTYPE, read_triangles
+
+MAGIC = b"STLPACK1"
+ALIGN = 64
+
+
+def _walk(src_dir, suffix):
+    found = []
+    for root, dirs, files in os.walk(src_dir):
+        for filename in files:
+            if filename.lower().endswith(suffix):
+                path = os.path.join(root, filename)
+                found.append(os.path.relpath(path, src_dir).replace(os.sep, "/"))
+    return sorted(found)
+
+
+def pack(src_dir, out_path, include_json=True):
+    """Write every .stl under src_dir (and .json sidecars) to out_path; returns the index."""
+    entries = []
+    arrays = []
+    offset = 0
+    for name in _walk(src_dir, ".stl"):
+        path = os.path.join(src_dir, name)
+        triangles = np.ascontiguousarray(read_triangles(path), dtype="<f4")
+        entries.append({"name": name, "offset": offset, "triangles": len(triangles), "sha256": file_hash(path)})
+        arrays.append(triangles)
+        offset += triangles.nbytes
+    sidecars = {}
+    if include_json:
+        for name in _walk(src_dir, ".json"):
+            with open(os.path.join(src_dir, name)) as f:
+                sidecars[name] = json.load(f)
+    index = json.dumps({"version": 1, "entries": entries, "sidecars": sidecars}).encode()
+    header_len = len(MAGIC) + 8 + len(index)
+    padding = -header_len % ALIGN
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(index)))
+        f.write(index)
+        f.write(b"\0" * padding)
+        for triangles in arrays:
+            f.write(triangles.tobytes())
+    os.replace(tmp_path, out_path)
+    return entries
+
+
+class StlPack:
+    """Read-only view of a pack; pack[name] / pack[i] return zero-copy (n, 3, 3) float32 arrays."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not an STL pack")
+            (index_len,) = struct.unpack("<Q", f.read(8))
+            index = json.loads(f.read(index_len))
+        header_len = len(MAGIC) + 8 + index_len
+        self.data_offset = header_len + (-header_len % ALIGN)
+        self.entries = index["entries"]
+        self.sidecars = index["sidecars"]
+        self._by_name = {entry["name"]: i for i, entry in enumerate(self.entries)}
+        data_bytes = os.path.getsize(path) - self.data_offset
+        self._data = np.memmap(path, dtype="<f4", mode="r", offset=self.data_offset, shape=(data_bytes // 4,))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def names(self):
+        return [entry["name"] for entry in self.entries]
+
+    def entry(self, key):
+        return self.entries[self._by_name[key] if isinstance(key, str) else key]
+
+    def __getitem__(self, key):
+        entry = self.entry(key)
+        start = entry["offset"] // 4
+        return self._data[start:start + entry["triangles"] * 9].reshape(-1, 3, 3)
+
+
+def _normals(triangles):
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+
+def unpack(pack_path, out_dir):
+    """Write every entry back out as a binary STL (normals recomputed) plus the JSON sidecars."""
+    stl_pack = StlPack(pack_path)
+    for name in stl_pack.names():
+        triangles = stl_pack[name]
+        records = np.zeros(len(triangles), dtype=RECORD_DTYPE)
+        records["vertices"] = triangles
+        records["normal"] = _normals(triangles)
+        path = os.path.join(out_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(b"Unpacked by stl_pack.py".ljust(HEADER_SIZE - 4, b"\0"))
+            f.write(struct.pack("<I", len(triangles)))
+            f.write(records.tobytes())
+    for name, data in stl_pack.sidecars.items():
+        path = os.path.join(out_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+    return len(stl_pack)
+
+
+def verify(pack_path, src_dir=None):
+    """Check the pack is internally consistent and, given src_dir, matches the loose files.
+
+    Returns (problems, warnings). Only differing triangles are a problem: a file whose bytes differ from the
+    packed source but holds the same triangles (e.g. one written by unpack, with a new header and normals)
+    is a warning.
+    """
+    stl_pack = StlPack(pack_path)
+    problems = []
+    warnings = []
+    for entry in stl_pack.entries:
+        end = entry["offset"] + entry["triangles"] * 36
+        if end > stl_pack._data.nbytes:
+            problems.append(f"{entry['name']}: data runs past the end of the pack")
+            continue
+        if src_dir is None:
+            continue
+        path = os.path.join(src_dir, entry["name"])
+        if not os.path.exists(path):
+            problems.append(f"{entry['name']}: missing from {src_dir}")
+        elif not np.array_equal(np.asarray(read_triangles(path), dtype="<f4"), stl_pack[entry["name"]]):
+            problems.append(f"{entry['name']}: triangle data differs")
+        elif file_hash(path) != entry["sha256"]:
+            warnings.append(f"{entry['name']}: same triangles, but not the file that was packed (header/normals)")
+    return problems, warnings
+
+
+def bench(pack_path, src_dir):
+    """Time reading every STL from loose files vs. the pack (touching all triangle data in both)."""
+    start = time.perf_counter()
+    loose_total = 0.0
+    for name in _walk(src_dir, ".stl"):
+        loose_total += float(np.asarray(read_triangles(os.path.join(src_dir, name))).sum())
+    loose = time.perf_counter() - start
+    start = time.perf_counter()
+    stl_pack = StlPack(pack_path)
+    packed_total = 0.0
+    for i in range(len(stl_pack)):
+        packed_total += float(stl_pack[i].sum())
+    packed = time.perf_counter() - start
+    print(f"loose files: {loose * 1000:.1f} ms, pack: {packed * 1000:.1f} ms ({loose / packed:.1f}x)")
+    return loose, packed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    p = commands.add_parser("pack")
+    p.add_argument("src_dir")
+    p.add_argument("pack")
+    p.add_argument("--no-json", action="store_true", help="do not embed .json sidecars")
+    p = commands.add_parser("unpack")
+    p.add_argument("pack")
+    p.add_argument("out_dir")
+    p = commands.add_parser("verify")
+    p.add_argument("pack")
+    p.add_argument("src_dir", nargs="?")
+    p = commands.add_parser("bench")
+    p.add_argument("pack")
+    p.add_argument("src_dir")
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        entries = pack(args.src_dir, args.pack, include_json=not args.no_json)
+        print(f"✅ Packed {len(entries)} STLs into {args.pack}")
+    elif args.command == "unpack":
+        print(f"✅ Unpacked {unpack(args.pack, args.out_dir)} STLs into {args.out_dir}")
+    elif args.command == "verify":
+        problems, warnings = verify(args.pack, args.src_dir)
+        for problem in problems:
+            print(f"❌ {problem}")
+        for warning in warnings:
+            print(f"⚠️ {warning}")
+        if problems:
+            return 1
+        print(f"✅ {args.pack} OK")
+    elif args.command == "bench":
+        bench(args.pack, args.src_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,44 @@
 """
 Shared STL → rotating MP4 pipeline (Blender/bpy). Imported by entrypoint scripts at repo root.
 """
+import argparse
 import bpy
+import hashlib
+import json
 import os
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import time
+import traceback
+from contextlib import contextmanager
 from math import radians
 from pathlib import Path
-import bmesh
+import numpy as np
 from mathutils import Vector
 
 import addon_utils
 
-addon_utils.enable("io_mesh_stl")
+from mesh_cache import DEFAULT_CACHE_DIR, load_normalized
+from mesh_symmetry import frame_sources, symmetry_order, unique_frames
+from stl_io import read_stl
+from frame_encode import (
+    FRAME_EXTENSIONS,
+    EncodeQueue,
+    encode_sequence,
+    encode_variants,
+    frame_path,
+    missing_frames,
+    parse_variants,
+    variant_path,
+    x264_args,
+)
+from render_queue import serve
+from render_manifest import file_hash, is_current, load_manifest, manifest_path, record_output, settings_hash
+from stl_jobs import filter_jobs, iter_jobs, read_allow_list, read_jobs_file, record_failure, write_progress
+from view_spec import is_still_name, load_views, still_name, stills_key_path, view_output_path
 
 frames = 120
 fps = 30
@@ -21,6 +49,65 @@ degrees_to_rotate = 360
 output_format = "MPEG4"
 video_codec = "H264"
 file_format = "FFMPEG"
+stl_importer = "native"  # "native" (stl_io + foreach_set) or "operator" (Blender's STL import operator)
+constant_rate_factor = "HIGH"
+engine = "CYCLES"
+samples = 32
+use_denoising = True
+exposure = 1.0
+resolution_percentage = 100
+max_bounces = 12
+diffuse_bounces = 4
+glossy_bounces = 4
+# Quality profiles (--profile); "final" is the stimulus-set setting, the others are for triage.
+profiles = {
+    "draft": {
+        "samples": 4,
+        "resolution_percentage": 50,
+        "max_bounces": 3,
+        "diffuse_bounces": 1,
+        "glossy_bounces": 1,
+    },
+    "review": {
+        "samples": 16,
+        "resolution_percentage": 100,
+        "max_bounces": 6,
+        "diffuse_bounces": 2,
+        "glossy_bounces": 2,
+    },
+    "final": {
+        "samples": 32,
+        "resolution_percentage": 100,
+        "max_bounces": 12,
+        "diffuse_bounces": 4,
+        "glossy_bounces": 4,
+    },
+}
+profile = "final"
+# Blender's default scene already samples adaptively at 0.01; these make it explicit and tunable.
+use_adaptive_sampling = True
+adaptive_threshold = 0.01
+adaptive_min_samples = 0
+time_limit = 0.0  # seconds per frame, 0 = no cap
+# Keep BVH, shaders and device data between frames (and between template-mode jobs).
+use_persistent_data = False
+# Level of detail (--lod): meshes over the triangle budget are decimated before rendering.
+# The budget defaults to triangles_per_pixel × rendered pixels (65k at 512×512, 16k for draft).
+use_lod = False
+lod_triangle_budget = 0  # explicit budget (--triangle-budget); 0 = derive from the resolution
+triangles_per_pixel = 0.25
+# Extra encodes of each video from the same master frames (--variants): (width in px, container).
+variants = []
+# (name, energy, location as multiples of the light distance, rotation in degrees)
+lights = [
+    ("MainLight", 10, (1, -1, 1), (45, 0, 45)),
+    ("FillLight", 8, (-1, 1, 0.5), (30, 0, -135)),
+    ("TopLight", 6, (0, 0, 2), (0, 0, 0)),
+    ("FrontLight", 5, (0, -1, 0), (90, 0, 0)),
+]
+world_color = (0.1, 0.3, 0.8, 1)
+material_inputs = {"Base Color": (0.9, 0.9, 0.9, 1.0), "Metallic": 0.0, "Roughness": 0.6}
+camera_lens = 50
 
 
 def _apply_render_settings():
@@ -28,19 +115,189 @@ def _apply_render_settings():
     bpy.context.scene.render.fps = fps
     bpy.context.scene.render.resolution_x = resolution[0]
     bpy.context.scene.render.resolution_y = resolution[1]
-    bpy.context.scene.render.resolution_percentage = 100
+    bpy.context.scene.render.resolution_percentage = resolution_percentage
     bpy.context.scene.render.ffmpeg.format = output_format
     bpy.context.scene.render.ffmpeg.codec = video_codec
-    bpy.context.scene.render.ffmpeg.constant_rate_factor = "HIGH"
-    bpy.context.scene.render.engine = "CYCLES"
-    bpy.context.scene.cycles.samples = 32
-    bpy.context.scene.cycles.use_denoising = True
-    bpy.context.scene.view_settings.exposure = 1.0
+    bpy.context.scene.render.ffmpeg.constant_rate_factor = constant_rate_factor
+    bpy.context.scene.render.engine = engine
+    bpy.context.scene.cycles.samples = samples
+    bpy.context.scene.cycles.use_denoising = use_denoising
+    bpy.context.scene.cycles.use_adaptive_sampling = use_adaptive_sampling
+    bpy.context.scene.cycles.adaptive_threshold = adaptive_threshold
+    bpy.context.scene.cycles.adaptive_min_samples = adaptive_min_samples
+    bpy.context.scene.cycles.time_limit = time_limit
+    bpy.context.scene.render.use_persistent_data = use_persistent_data
+    bpy.context.scene.cycles.max_bounces = max_bounces
+    bpy.context.scene.cycles.diffuse_bounces = diffuse_bounces
+    bpy.context.scene.cycles.glossy_bounces = glossy_bounces
+    bpy.context.scene.view_settings.exposure = exposure
 
 
 _apply_render_settings()
 
 
+def apply_profile(name):
+    """Switch the module render settings to a named entry of `profiles` and push them to the scene."""
+    global profile
+    if name not in profiles:
+        raise ValueError(f"Unknown profile {name!r}; choose from {', '.join(profiles)}")
+    globals().update(profiles[name])
+    profile = name
+    _apply_render_settings()
+
+
+def apply_sampling_options(max_samples=None, noise_threshold=None, frame_time_limit=None):
+    """Override the profile's sample cap, adaptive noise threshold and per-frame time cap."""
+    global samples, use_adaptive_sampling, adaptive_threshold, time_limit
+    if max_samples:
+        samples = max_samples
+    if noise_threshold is not None:
+        use_adaptive_sampling = noise_threshold > 0
+        adaptive_threshold = noise_threshold
+    if frame_time_limit is not None:
+        time_limit = frame_time_limit
+    _apply_render_settings()
+
+
+def apply_persistent_data(enabled):
+    global use_persistent_data
+    use_persistent_data = enabled
+    _apply_render_settings()
+
+
+def apply_variants(spec):
+    global variants
+    variants = parse_variants(spec) if spec else []
+
+
+def variant_outputs(output_path):
+    """(path, width, container) for every --variants encode of output_path."""
+    return [(variant_path(output_path, width, container), width, container) for width, container in variants]
+
+
+def apply_lod(enabled, budget=0):
+    global use_lod, lod_triangle_budget
+    use_lod = enabled
+    lod_triangle_budget = budget
+
+
+def triangle_budget():
+    """Triangle limit under --lod (0 = no decimation)."""
+    if not use_lod:
+        return 0
+    if lod_triangle_budget:
+        return lod_triangle_budget
+    scale = resolution_percentage / 100
+    return int(resolution[0] * scale * resolution[1] * scale * triangles_per_pixel)
+
+
+def decimate_to_budget(obj, budget):
+    """Collapse-decimate obj's mesh to about budget triangles; returns the fraction of faces kept."""
+    faces = len(obj.data.polygons)
+    if not budget or faces <= budget:
+        return 1.0
+    modifier = obj.modifiers.new("LOD", "DECIMATE")
+    modifier.decimate_type = "COLLAPSE"
+    modifier.ratio = budget / faces
+    modifier.use_collapse_triangulate = True
+    decimated = bpy.data.meshes.new_from_object(obj.evaluated_get(bpy.context.evaluated_depsgraph_get()))
+    obj.modifiers.remove(modifier)
+    old_mesh = obj.data
+    obj.data = decimated
+    if old_mesh.users == 0:
+        bpy.data.meshes.remove(old_mesh)
+    decimated.name = obj.name
+    return len(decimated.polygons) / faces
+
+
+def mesh_from_arrays(name, vertices, faces):
+    """Build a mesh datablock straight from (n, 3) vertex and (k, 3) triangle index arrays."""
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(vertices, dtype=np.float32).ravel())
+    mesh.loops.add(faces.size)
+    mesh.loops.foreach_set("vertex_index", np.ascontiguousarray(faces, dtype=np.int32).ravel())
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, faces.size, 3, dtype=np.int32))
+    mesh.update()
+    mesh.validate()
+    return mesh
+
+
+def _link_new_object(name, mesh):
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.collection.objects.link(obj)
+    for other in bpy.context.selected_objects:
+        other.select_set(False)
+    obj.select_set(True)
+    bpy.context.view_layer.objects.active = obj
+    return obj
+
+
+def _import_stl_operator(stl_path):
+    if hasattr(bpy.ops.wm, "stl_import"):
+        bpy.ops.wm.stl_import(filepath=stl_path)
+    else:
+        addon_utils.enable("io_mesh_stl")
+        bpy.ops.import_mesh.stl(filepath=stl_path)
+    if not bpy.context.selected_objects:
+        raise RuntimeError(f"STL import produced no object: {stl_path}")
+    return bpy.context.selected_objects[0]
+
+
+def import_stl(stl_path):
+    """Load an STL as a new selected, active object named after the file."""
+    if stl_importer == "operator":
+        return _import_stl_operator(stl_path)
+    name = os.path.splitext(os.path.basename(stl_path))[0]
+    vertices, faces = read_stl(stl_path)
+    return _link_new_object(name, mesh_from_arrays(name, vertices, faces))
+
+
+def import_cached_stl(stl_path, cache_dir, target_size=2.0, stl_hash=None):
+    """Like import_stl + center_and_scale_object, but geometry comes pre-normalized from the mesh cache."""
+    name = os.path.splitext(os.path.basename(stl_path))[0]
+    cached = load_normalized(stl_path, cache_dir, stl_hash)
+    return _link_new_object(name, mesh_from_arrays(name, cached["vertices"] * target_size, cached["faces"]))
+
+
+def render_settings():
+    """Everything that affects the rendered pixels/container; hashed into the render manifest."""
+    settings = {
+        "frames": frames,
+        "fps": fps,
+        "profile": profile,
+        "resolution": list(resolution),
+        "resolution_percentage": resolution_percentage,
+        "rotation_axis": rotation_axis,
+        "degrees_to_rotate": degrees_to_rotate,
+        "file_format": file_format,
+        "output_format": output_format,
+        "video_codec": video_codec,
+        "constant_rate_factor": constant_rate_factor,
+        "engine": engine,
+        "samples": samples,
+        "use_denoising": use_denoising,
+        "use_adaptive_sampling": use_adaptive_sampling,
+        "adaptive_threshold": adaptive_threshold,
+        "adaptive_min_samples": adaptive_min_samples,
+        "time_limit": time_limit,
+        "max_bounces": max_bounces,
+        "diffuse_bounces": diffuse_bounces,
+        "glossy_bounces": glossy_bounces,
+        "exposure": exposure,
+        "lights": [list(light) for light in lights],
+        "world_color": list(world_color),
+        "material_inputs": {k: v for k, v in material_inputs.items()},
+        "camera_lens": camera_lens,
+    }
+    # Only present when decimating, so enabling --lod does not invalidate outputs rendered without it.
+    if triangle_budget():
+        settings["triangle_budget"] = triangle_budget()
+    # --variants is deliberately absent: extra encodes never change the master pixels (see add_missing_variants).
+    return settings
+
+
 def clear_scene():
     bpy.ops.object.select_all(action="SELECT")
     bpy.ops.object.delete(use_global=False)
@@ -52,85 +309,123 @@ def clear_scene():
         bpy.data.lights.remove(block)
     for block in bpy.data.cameras:
         bpy.data.cameras.remove(block)
+    for block in bpy.data.actions:
+        bpy.data.actions.remove(block)
+    purge_orphans()
+
+
+def purge_orphans():
+    """Remove every datablock with no users, recursively (F-curves, node trees, images left behind)."""
+    bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+
+
+# Datablock collections tracked per job by --memory-report / --check-leaks.
+TRACKED_DATABLOCKS = (
+    "objects", "meshes", "materials", "lights", "cameras", "actions",
+    "node_groups", "images", "worlds", "collections",
+)
+
+
+def datablock_counts():
+    return {name: len(getattr(bpy.data, name)) for name in TRACKED_DATABLOCKS}
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+    except OSError:
+        return None  # not Linux; peak_rss_mb in the timings record still applies
+
+
+class LeakCheck:
+    """Compare datablock counts after each job with the counts after the first (warm-up) job."""
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.baseline = None
+
+    def after_job(self, label):
+        counts = datablock_counts()
+        if self.baseline is None:
+            self.baseline = counts
+            return counts
+        grown = {name: (self.baseline[name], n) for name, n in counts.items() if n > self.baseline[name]}
+        if grown and self.enabled:
+            detail = ", ".join(f"{name} {old}→{new}" for name, (old, new) in grown.items())
+            raise RuntimeError(f"Datablock counts grew after {label}: {detail}")
+        return counts
 
 
 def center_and_scale_object(obj, target_size=2.0):
-    bpy.context.view_layer.objects.active = obj
-    obj.select_set(True)
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-    bpy.ops.object.mode_set(mode="EDIT")
-    bpy.ops.mesh.select_all(action="SELECT")
-    bm = bmesh.from_edit_mesh(obj.data)
-    bm.faces.ensure_lookup_table()
-    bm.verts.ensure_lookup_table()
-    if bm.verts:
-        verts = [v.co.copy() for v in bm.verts]
-        min_x = min(v.x for v in verts)
-        max_x = max(v.x for v in verts)
-        min_y = min(v.y for v in verts)
-        max_y = max(v.y for v in verts)
-        min_z = min(v.z for v in verts)
-        max_z = max(v.z for v in verts)
-        center = Vector(((min_x + max_x) / 2, (min_y + max_y) / 2, (min_z + max_z) / 2))
-        dimensions = Vector((max_x - min_x, max_y - min_y, max_z - min_z))
-        max_dim = max(dimensions.x, dimensions.y, dimensions.z)
-        for v in bm.verts:
-            v.co -= center
-        if max_dim > 0:
-            scale_factor = target_size / max_dim
-            for v in bm.verts:
-                v.co *= scale_factor
-    bmesh.update_edit_mesh(obj.data)
-    bpy.ops.object.mode_set(mode="OBJECT")
+    """Bake the object transform, center the bounding box on the origin and scale its largest side to target_size.
+
+    Works on the mesh data API in OBJECT mode: one foreach_get, vectorized bounds/transform, one foreach_set.
+    """
+    mesh = obj.data
+    count = len(mesh.vertices)
+    if count:
+        co = np.empty(count * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        basis = np.array(obj.matrix_basis, dtype=np.float64)
+        co = co.reshape(count, 3) @ basis[:3, :3].T + basis[:3, 3]
+        low, high = co.min(axis=0), co.max(axis=0)
+        max_dim = (high - low).max()
+        scale_factor = target_size / max_dim if max_dim > 0 else 1.0
+        co = (co - (low + high) / 2) * scale_factor
+        mesh.vertices.foreach_set("co", co.astype(np.float32).ravel())
+        if np.linalg.det(basis[:3, :3]) < 0:
+            # A mirroring transform turns faces inside out, as transform_apply would correct.
+            mesh.flip_normals()
+        mesh.update()
     obj.location = (0, 0, 0)
     obj.rotation_euler = (0, 0, 0)
     obj.scale = (1, 1, 1)
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
     return target_size
 
 
 def setup_scene(obj, object_size):
+    cam = _create_camera()
+    fit_camera(cam, object_size)
+    setup_lighting(object_size)
+    setup_world_background()
+    apply_material(obj)
+
+
+def _create_camera():
     cam_data = bpy.data.cameras.new("Camera")
     cam = bpy.data.objects.new("Camera", cam_data)
     bpy.context.collection.objects.link(cam)
     bpy.context.scene.camera = cam
+    cam.data.lens = camera_lens
+    cam.data.clip_end = 1000
+    return cam
+
+
+def fit_camera(cam, object_size, elevation=None, azimuth=-45.0):
+    """Aim cam at the origin; elevation/azimuth (degrees) move it on a sphere of the standard distance."""
     distance = object_size * 3.0
     cam.location = (distance * 0.8, -distance * 0.8, object_size * 0.2)
+    if elevation is not None:
+        radius = cam.location.length
+        cam.location = (
+            radius * np.cos(radians(elevation)) * np.cos(radians(azimuth)),
+            radius * np.cos(radians(elevation)) * np.sin(radians(azimuth)),
+            radius * np.sin(radians(elevation)),
+        )
     direction = Vector((0, 0, 0)) - cam.location
     cam.rotation_euler = direction.to_track_quat("-Z", "Y").to_euler()
-    cam.data.lens = 50
-    cam.data.clip_end = 1000
-    setup_lighting(object_size)
-    setup_world_background()
-    apply_material(obj)
 
 
 def setup_lighting(object_size):
     distance = object_size * 4
-    main_light_data = bpy.data.lights.new(name="MainLight", type="SUN")
-    main_light_data.energy = 10
-    main_light = bpy.data.objects.new(name="MainLight", object_data=main_light_data)
-    bpy.context.collection.objects.link(main_light)
-    main_light.location = (distance, -distance, distance)
-    main_light.rotation_euler = (radians(45), 0, radians(45))
-    fill_light_data = bpy.data.lights.new(name="FillLight", type="SUN")
-    fill_light_data.energy = 8
-    fill_light = bpy.data.objects.new(name="FillLight", object_data=fill_light_data)
-    bpy.context.collection.objects.link(fill_light)
-    fill_light.location = (-distance, distance, distance * 0.5)
-    fill_light.rotation_euler = (radians(30), 0, radians(-135))
-    top_light_data = bpy.data.lights.new(name="TopLight", type="SUN")
-    top_light_data.energy = 6
-    top_light = bpy.data.objects.new(name="TopLight", object_data=top_light_data)
-    bpy.context.collection.objects.link(top_light)
-    top_light.location = (0, 0, distance * 2)
-    top_light.rotation_euler = (0, 0, 0)
-    front_light_data = bpy.data.lights.new(name="FrontLight", type="SUN")
-    front_light_data.energy = 5
-    front_light = bpy.data.objects.new(name="FrontLight", object_data=front_light_data)
-    bpy.context.collection.objects.link(front_light)
-    front_light.location = (0, -distance, 0)
-    front_light.rotation_euler = (radians(90), 0, 0)
+    for name, energy, location, rotation in lights:
+        light_data = bpy.data.lights.new(name=name, type="SUN")
+        light_data.energy = energy
+        light = bpy.data.objects.new(name=name, object_data=light_data)
+        bpy.context.collection.objects.link(light)
+        light.location = tuple(c * distance for c in location)
+        light.rotation_euler = tuple(radians(a) for a in rotation)
 
 
 def setup_world_background():
@@ -139,22 +434,21 @@ def setup_world_background():
     nodes = world.node_tree.nodes
     nodes.clear()
     bg_node = nodes.new(type="ShaderNodeBackground")
-    bg_node.inputs[0].default_value = (0.1, 0.3, 0.8, 1)
+    bg_node.inputs[0].default_value = world_color
     bg_node.inputs[1].default_value = 1.0
     output_node = nodes.new(type="ShaderNodeOutputWorld")
     world.node_tree.links.new(bg_node.outputs[0], output_node.inputs[0])
 
 
-def apply_material(obj):
+def create_material():
     mat = bpy.data.materials.new(name="ObjectMaterial")
     mat.use_nodes = True
     nodes = mat.node_tree.nodes
     links = mat.node_tree.links
     nodes.clear()
     principled = nodes.new(type="ShaderNodeBsdfPrincipled")
-    principled.inputs["Base Color"].default_value = (0.9, 0.9, 0.9, 1.0)
-    principled.inputs["Metallic"].default_value = 0.0
-    principled.inputs["Roughness"].default_value = 0.6
+    for name, value in material_inputs.items():
+        principled.inputs[name].default_value = value
     try:
         principled.inputs["Specular IOR Level"].default_value = 1.0
     except KeyError:
@@ -164,30 +458,204 @@ def apply_material(obj):
             pass
     output = nodes.new(type="ShaderNodeOutputMaterial")
     links.new(principled.outputs[0], output.inputs[0])
+    return mat
+
+
+def apply_material(obj, mat=None):
+    if mat is None:
+        mat = create_material()
     obj.data.materials.clear()
     obj.data.materials.append(mat)
 
 
-def animate_rotation(obj, total_frames):
+# Template mode: camera, lights, world and material are built once per Blender
+# session and only the stimulus mesh datablock changes between jobs.
+_template = {}
+
+
+def _template_ready():
+    try:
+        return all(_template[key].name for key in ("camera", "material"))
+    except (KeyError, ReferenceError):
+        return False
+
+
+def setup_template_scene(object_size):
+    """Build the persistent rig (camera, lights, world, material) for template mode."""
+    clear_scene()
+    _template.clear()
+    cam = _create_camera()
+    fit_camera(cam, object_size)
+    setup_lighting(object_size)
+    setup_world_background()
+    _template["camera"] = cam
+    material = create_material()
+    # Between jobs no mesh uses the material; keep purge_orphans from deleting it.
+    material.use_fake_user = True
+    _template["material"] = material
+
+
+def swap_template_mesh(obj, object_size):
+    """Move obj's mesh onto the persistent stimulus object and refit the camera."""
+    stimulus = _template.get("object")
+    try:
+        stimulus_alive = stimulus is not None and stimulus.name is not None
+    except ReferenceError:
+        stimulus_alive = False
+    if stimulus_alive and stimulus != obj:
+        old_mesh = stimulus.data
+        stimulus.data = obj.data
+        bpy.data.objects.remove(obj)
+        if old_mesh.users == 0:
+            bpy.data.meshes.remove(old_mesh)
+        obj = stimulus
+    _template["object"] = obj
+    apply_material(obj, _template["material"])
+    purge_orphans()
+    fit_camera(_template["camera"], object_size)
+    return obj
+
+
+def animate_rotation(obj, total_frames, start_frame=1, axis=None):
+    axis = axis or rotation_axis
+    end_frame = start_frame + total_frames - 1
     obj.rotation_mode = "XYZ"
     obj.location = (0, 0, 0)
     obj.rotation_euler = (0, 0, 0)
-    obj.keyframe_insert(data_path="rotation_euler", frame=1)
-    obj.keyframe_insert(data_path="location", frame=1)
-    if rotation_axis == "X":
+    obj.keyframe_insert(data_path="rotation_euler", frame=start_frame)
+    obj.keyframe_insert(data_path="location", frame=start_frame)
+    if axis == "X":
         obj.rotation_euler = (radians(degrees_to_rotate), 0, 0)
-    elif rotation_axis == "Y":
+    elif axis == "Y":
         obj.rotation_euler = (0, radians(degrees_to_rotate), 0)
     else:
         obj.rotation_euler = (0, 0, radians(degrees_to_rotate))
-    obj.keyframe_insert(data_path="rotation_euler", frame=total_frames)
-    obj.keyframe_insert(data_path="location", frame=total_frames)
+    obj.keyframe_insert(data_path="rotation_euler", frame=end_frame)
+    obj.keyframe_insert(data_path="location", frame=end_frame)
     if obj.animation_data:
         for fcurve in obj.animation_data.action.fcurves:
             for keyframe in fcurve.keyframe_points:
                 keyframe.interpolation = "LINEAR"
 
 
+def key_visibility_window(obj, first_frame, last_frame):
+    """Make obj render only in frames first_frame..last_frame (boolean keys hold their value)."""
+    if first_frame > 1:
+        obj.hide_render = True
+        obj.keyframe_insert(data_path="hide_render", frame=first_frame - 1)
+    obj.hide_render = False
+    obj.keyframe_insert(data_path="hide_render", frame=first_frame)
+    obj.hide_render = True
+    obj.keyframe_insert(data_path="hide_render", frame=last_frame + 1)
+
+
+def _axis_rotation(angle, axis):
+    c, s = np.cos(angle), np.sin(angle)
+    if axis == "X":
+        return np.array([[1, 0, 0], [0, c, -s], [0, s, c]])
+    if axis == "Y":
+        return np.array([[c, 0, s], [0, 1, 0], [-s, 0, c]])
+    return np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+
+
+def detect_symmetry(obj, tolerance=0.001, axis=None):
+    """(order, sources) for the object's rotational symmetry about axis (default rotation_axis).
+
+    tolerance is relative to the object's largest side. sources maps every frame of animate_rotation to the
+    first frame with the same image; frame `frames` repeats frame 1 for any full turn, even without symmetry.
+    """
+    count = len(obj.data.vertices)
+    co = np.empty(count * 3, dtype=np.float32)
+    obj.data.vertices.foreach_get("co", co)
+    co = co.reshape(count, 3)
+    size = float((co.max(axis=0) - co.min(axis=0)).max()) if count else 0.0
+    order = symmetry_order(co, axis or rotation_axis, tolerance * size, frames=frames, degrees=degrees_to_rotate)
+    return order, frame_sources(frames, degrees_to_rotate, order)
+
+
+def silhouette_border(objects, margin_px=4, axis=None):
+    """Normalized (min_x, max_x, min_y, max_y) image rectangle covering the objects at every spin angle.
+
+    Projects the mesh vertices (the silhouette of a triangle mesh lies inside their projection)
+    through the scene camera for each frame of animate_rotation, plus a few pixels for the pixel
+    filter and denoiser.
+    """
+    scene = bpy.context.scene
+    cam = scene.camera
+    res_x = scene.render.resolution_x * scene.render.resolution_percentage / 100
+    res_y = scene.render.resolution_y * scene.render.resolution_percentage / 100
+    projection = np.array(cam.calc_matrix_camera(
+        bpy.context.evaluated_depsgraph_get(),
+        x=int(res_x),
+        y=int(res_y),
+        scale_x=scene.render.pixel_aspect_x,
+        scale_y=scene.render.pixel_aspect_y,
+    ))
+    world_to_clip = projection @ np.array(cam.matrix_world.inverted())
+    angles = np.radians(degrees_to_rotate) * np.arange(frames) / max(frames - 1, 1)
+    low = np.full(2, np.inf)
+    high = np.full(2, -np.inf)
+    for obj in objects:
+        count = len(obj.data.vertices)
+        if not count:
+            continue
+        co = np.empty(count * 3, dtype=np.float32)
+        obj.data.vertices.foreach_get("co", co)
+        co = co.reshape(count, 3).astype(np.float64)
+        for angle in angles:
+            clip = np.c_[co @ _axis_rotation(angle, axis or rotation_axis).T, np.ones(count)] @ world_to_clip.T
+            if (clip[:, 3] <= 0).any():
+                return 0.0, 1.0, 0.0, 1.0  # geometry behind the camera; no safe crop
+            ndc = clip[:, :2] / clip[:, 3:4]
+            low = np.minimum(low, ndc.min(axis=0))
+            high = np.maximum(high, ndc.max(axis=0))
+    if not np.isfinite(low).all():
+        return 0.0, 1.0, 0.0, 1.0
+    margin = np.array([margin_px / res_x, margin_px / res_y])
+    low = np.clip((low + 1) / 2 - margin, 0.0, 1.0)
+    high = np.clip((high + 1) / 2 + margin, 0.0, 1.0)
+    return float(low[0]), float(high[0]), float(low[1]), float(high[1])
+
+
+def setup_background_composite(enabled):
+    """Composite the render over the constant world color, filling pixels outside the render border."""
+    scene = bpy.context.scene
+    scene.use_nodes = enabled
+    if not enabled:
+        return
+    nodes = scene.node_tree.nodes
+    links = scene.node_tree.links
+    nodes.clear()
+    layers = nodes.new(type="CompositorNodeRLayers")
+    background = nodes.new(type="CompositorNodeRGB")
+    # The camera sees the world background unlit, so its pixels are exactly color × strength (1.0).
+    background.outputs[0].default_value = world_color
+    over = nodes.new(type="CompositorNodeAlphaOver")
+    output = nodes.new(type="CompositorNodeComposite")
+    links.new(background.outputs[0], over.inputs[1])
+    links.new(layers.outputs["Image"], over.inputs[2])
+    links.new(over.outputs[0], output.inputs["Image"])
+
+
+def set_render_border(objects=None, axis=None):
+    """Path-trace only the objects' swept silhouette (objects=None renders the full frame again).
+
+    Returns the fraction of the frame that is rendered.
+    """
+    render = bpy.context.scene.render
+    if not objects:
+        render.use_border = False
+        setup_background_composite(False)
+        return 1.0
+    min_x, max_x, min_y, max_y = silhouette_border(objects, axis=axis)
+    render.use_border = True
+    render.use_crop_to_border = False
+    render.border_min_x, render.border_max_x = min_x, max_x
+    render.border_min_y, render.border_max_y = min_y, max_y
+    setup_background_composite(True)
+    return (max_x - min_x) * (max_y - min_y)
+
+
 def render_video(output_path):
     bpy.context.scene.frame_start = 1
     bpy.context.scene.frame_end = frames
@@ -195,30 +663,982 @@ def render_video(output_path):
     bpy.ops.render.render(animation=True)
 
 
-def main(input_folder: str, output_folder: str):
-    """Walk input_folder for .stl (any depth), mirror relative paths under output_folder."""
-    os.makedirs(output_folder, exist_ok=True)
-    input_folder = os.path.abspath(input_folder)
-    for root, dirs, files in os.walk(input_folder):
-        for filename in files:
-            if not filename.lower().endswith(".stl"):
+class FrameStats:
+    """Per-frame wall time, scene sync time and Cycles samples reached, collected from the render handlers.
+
+    Sync time runs from render_pre to the first progress message reporting samples.
+    """
+
+    _sample_re = re.compile(r"Sample (\d+)/\d+|(\d+)/\d+ [Ss]amples")
+
+    def __init__(self):
+        self.frames = []
+        self._current = None
+
+    def _on_pre(self, scene, *args):
+        self._current = {
+            "frame": scene.frame_current,
+            "start": time.perf_counter(),
+            "sync": None,
+            "samples": None,
+        }
+
+    def _on_stats(self, stats, *args):
+        match = self._sample_re.search(str(stats))
+        if match and self._current is not None:
+            self._current["samples"] = int(match.group(1) or match.group(2))
+            if self._current["sync"] is None:
+                self._current["sync"] = round(time.perf_counter() - self._current["start"], 4)
+
+    def _on_post(self, scene, *args):
+        if self._current is None:
+            return
+        start = self._current.pop("start")
+        self._current["seconds"] = round(time.perf_counter() - start, 4)
+        self.frames.append(self._current)
+        self._current = None
+
+    def __enter__(self):
+        bpy.app.handlers.render_pre.append(self._on_pre)
+        bpy.app.handlers.render_stats.append(self._on_stats)
+        bpy.app.handlers.render_post.append(self._on_post)
+        return self
+
+    def __exit__(self, *exc):
+        bpy.app.handlers.render_pre.remove(self._on_pre)
+        bpy.app.handlers.render_stats.remove(self._on_stats)
+        bpy.app.handlers.render_post.remove(self._on_post)
+        return False
+
+    def summary(self):
+        if not self.frames:
+            return "no frames rendered"
+        seconds = [f["seconds"] for f in self.frames]
+        counts = [f["samples"] for f in self.frames if f["samples"] is not None]
+        syncs = [f["sync"] for f in self.frames if f["sync"] is not None]
+        text = f"{len(seconds)} frames, {sum(seconds) / len(seconds):.2f}s/frame"
+        if syncs:
+            text += f", sync {sum(syncs) / len(syncs) * 1000:.0f} ms/frame"
+        if counts:
+            text += f", samples min/mean/max {min(counts)}/{sum(counts) / len(counts):.1f}/{max(counts)}"
+        return text
+
+
+def frames_dir_for(output_path):
+    return os.path.splitext(output_path)[0] + "_frames"
+
+
+def _prepare_frames_dir(frames_dir, key):
+    # Frames left by an interrupted run are only reused if STL and settings are unchanged.
+    key_file = os.path.join(frames_dir, "render_key.txt")
+    if os.path.isdir(frames_dir):
+        previous = ""
+        if os.path.exists(key_file):
+            with open(key_file) as f:
+                previous = f.read()
+        if previous != key:
+            shutil.rmtree(frames_dir)
+    os.makedirs(frames_dir, exist_ok=True)
+    with open(key_file, "w") as f:
+        f.write(key)
+
+
+def render_frames(frames_dir, image_format="PNG", key="", sources=None):
+    """Render numbered stills into frames_dir, skipping frames that already exist; returns frames rendered.
+
+    sources maps a frame to an earlier frame showing the same image (see detect_symmetry); such frames are copied.
+    """
+    _prepare_frames_dir(frames_dir, key)
+    scene = bpy.context.scene
+    ext = FRAME_EXTENSIONS[image_format]
+    scene.frame_start = 1
+    scene.frame_end = frames
+    scene.render.image_settings.file_format = image_format
+    rendered = 0
+    try:
+        for frame in range(1, frames + 1):
+            final_path = frame_path(frames_dir, frame, ext)
+            if os.path.exists(final_path):
                 continue
-            stl_path = os.path.join(root, filename)
-            rel_dir = os.path.relpath(root, input_folder)
-            if rel_dir in (os.curdir, ".", ""):
-                output_subfolder = output_folder
-            else:
-                output_subfolder = os.path.join(output_folder, rel_dir)
-            os.makedirs(output_subfolder, exist_ok=True)
-            base_name = os.path.splitext(filename)[0]
-            output_path = os.path.join(output_subfolder, base_name + ".mp4")
-            print(f"Processing {stl_path}")
+            # Render to a temp name so a kill mid-write never leaves a truncated frame behind.
+            tmp_path = final_path[: -len(ext)] + "partial." + ext
+            source = sources.get(frame, frame) if sources else frame
+            if source != frame:
+                shutil.copyfile(frame_path(frames_dir, source, ext), tmp_path)
+                os.replace(tmp_path, final_path)
+                continue
+            scene.frame_set(frame)
+            scene.render.filepath = tmp_path
+            bpy.ops.render.render(write_still=True)
+            os.replace(tmp_path, final_path)
+            rendered += 1
+    finally:
+        scene.render.image_settings.file_format = file_format
+    return rendered
+
+
+def render_sequence_video(
+    output_path, image_format="PNG", key="", keep_frames=False, encoder=None, on_done=None, sources=None
+):
+    """Render the frame sequence, then encode it now or hand it to a background EncodeQueue.
+
+    on_done(output_path, encode) gets the encode {"wall", "cpu"} timings once the MP4 is in place.
+    """
+    frames_dir = frames_dir_for(output_path)
+    rendered = render_frames(frames_dir, image_format, key, sources)
+    print(f"Rendered {rendered}/{frames} frames into {frames_dir}")
+    encode_frames(output_path, image_format, keep_frames, encoder, on_done)
+
+
+def scene_x264_args():
+    """The scene's H.264 writer settings as ffmpeg options, so encoded sequences match Blender-written MP4s."""
+    settings = bpy.context.scene.render.ffmpeg
+    b_frames = settings.max_b_frames if settings.use_max_b_frames else None
+    return x264_args(settings.gopsize, b_frames, settings.ffmpeg_preset)
+
+
+def encode_frames(output_path, image_format="PNG", keep_frames=False, encoder=None, on_done=None):
+    """Encode the complete sequence in frames_dir_for(output_path), synchronously or via an EncodeQueue."""
+    frames_dir = frames_dir_for(output_path)
+    encode_args = dict(
+        ext=FRAME_EXTENSIONS[image_format],
+        crf=constant_rate_factor,
+        keep_frames=keep_frames,
+        variants=variant_outputs(output_path),
+        x264=scene_x264_args(),
+    )
+    if encoder is not None:
+        encoder.submit(frames_dir, output_path, fps, frames, on_done=on_done, **encode_args)
+        return
+    encode = encode_sequence(frames_dir, output_path, fps, frames, **encode_args)
+    if on_done is not None:
+        on_done(output_path, encode)
+
+
+def parse_args(argv=None):
+    """Options passed after ``--`` on the Blender command line."""
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="stl_spin_render")
+    parser.add_argument(
+        "--template",
+        action="store_true",
+        help="build camera/lights/world/material once and only swap the mesh per STL",
+    )
+    parser.add_argument("--input", help="input folder (render_worker.py)")
+    parser.add_argument("--output", help="output folder (render_worker.py)")
+    parser.add_argument(
+        "--jobs-file",
+        help="JSON list of [stl_path, output_path] to render instead of walking the input folder",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=sorted(profiles),
+        default="final",
+        help="render-quality profile (draft/review for triage, final for the stimulus set)",
+    )
+    parser.add_argument("--max-samples", type=int, help="Cycles sample cap (overrides the profile)")
+    parser.add_argument(
+        "--noise-threshold",
+        type=float,
+        help="adaptive sampling noise threshold (0 disables adaptive sampling; Blender default 0.01)",
+    )
+    parser.add_argument("--frame-time-limit", type=float, help="per-frame Cycles time cap in seconds (0 = none)")
+    parser.add_argument(
+        "--persistent-data",
+        action="store_true",
+        help="keep BVH/shader/device data alive across frames and template-mode jobs",
+    )
+    parser.add_argument(
+        "--timings-log",
+        help="JSON-lines file for per-job stage timings (default: <output folder>_timings.jsonl)",
+    )
+    parser.add_argument("--memory-report", action="store_true", help="print RSS and datablock counts after each job")
+    parser.add_argument(
+        "--check-leaks",
+        action="store_true",
+        help="fail if datablock counts grow compared with the first job of the session",
+    )
+    parser.add_argument("--frame-log", help="append per-frame JSON lines (output, frame, seconds, samples) here")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="re-render even if the manifest says the output is up to date",
+    )
+    parser.add_argument(
+        "--sequence",
+        choices=list(FRAME_EXTENSIONS),
+        help="render numbered frames (resumable, display-referred) and encode the MP4 with ffmpeg once complete",
+    )
+    parser.add_argument(
+        "--pipeline",
+        type=int,
+        default=0,
+        metavar="N",
+        help="encode finished sequences in background ffmpeg processes (at most N queued) "
+        "while the next object renders; implies --sequence PNG",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        metavar="K",
+        help="load K objects into one timeline on the template rig, render the combined range once "
+        "and split it into per-object videos; implies --sequence PNG",
+    )
+    parser.add_argument("--keep-frames", action="store_true", help="keep --sequence frames after encoding")
+    parser.add_argument(
+        "--importer",
+        choices=["native", "operator"],
+        default="native",
+        help="STL loader: NumPy reader + foreach_set (default) or Blender's import operator",
+    )
+    parser.add_argument(
+        "--mesh-cache",
+        default=DEFAULT_CACHE_DIR,
+        metavar="DIR",
+        help="normalized-geometry cache for the native importer (default: .mesh_cache/ in the repo)",
+    )
+    parser.add_argument("--no-mesh-cache", dest="mesh_cache", action="store_const", const=None)
+    parser.add_argument("--serve", metavar="QUEUE_DIR", help="resident worker: take jobs from a render_queue.py queue")
+    parser.add_argument("--idle-exit", type=float, help="with --serve, exit after this many idle seconds")
+    parser.add_argument(
+        "--symmetry",
+        action="store_true",
+        help="detect n-fold symmetry about the spin axis and copy repeated frames instead of rendering them "
+        "(not with --batch-size); implies --sequence PNG",
+    )
+    parser.add_argument(
+        "--symmetry-tolerance",
+        type=float,
+        default=0.001,
+        help="vertex match tolerance as a fraction of the object size (default 0.001)",
+    )
+    parser.add_argument(
+        "--auto-crop",
+        action="store_true",
+        help="path-trace only the object's swept silhouette; the rest is filled with the world color",
+    )
+    parser.add_argument("--threads", type=int, default=0, help="Cycles thread budget (0 = all cores)")
+    parser.add_argument(
+        "--failures-log",
+        help="JSON-lines log of failed jobs with tracebacks (default: OUTPUT_failures.jsonl)",
+    )
+    parser.add_argument(
+        "--lod",
+        action="store_true",
+        help="decimate meshes above a triangle budget derived from the output resolution",
+    )
+    parser.add_argument(
+        "--triangle-budget",
+        type=int,
+        default=0,
+        help="explicit triangle budget for decimation (implies --lod)",
+    )
+    parser.add_argument(
+        "--views",
+        metavar="SPEC_JSON",
+        help="render several outputs per STL (spin axes, camera elevations, still grid) from one import; "
+        "see view_spec.py",
+    )
+    parser.add_argument(
+        "--variants",
+        metavar="WIDTH[:FORMAT],...",
+        help="also encode each video at these widths / containers (mp4, webm, webp) from the same frames, "
+        "e.g. 256,128,512:webm,256:webp; implies --sequence PNG",
+    )
+    parser.add_argument("--allow-list", help="render only the STLs listed here (see stl_validate.py)")
+    parser.add_argument("--progress", help="file the current job is written to, for render_launcher's watchdog")
+    args = parser.parse_args(argv)
+    if args.views and args.batch_size > 1:
+        parser.error("--views renders one STL at a time; it cannot be combined with --batch-size")
+    if args.symmetry and args.batch_size > 1:
+        parser.error("--symmetry renders one STL at a time; it cannot be combined with --batch-size")
+    if args.variants:
+        try:
+            parse_variants(args.variants)
+        except ValueError as exc:
+            parser.error(f"--variants: {exc}")
+    if (args.pipeline or args.batch_size > 1 or args.symmetry or args.variants) and not args.sequence:
+        args.sequence = "PNG"
+    return args
+
+
+def apply_thread_budget(threads):
+    render = bpy.context.scene.render
+    if threads > 0:
+        render.threads_mode = "FIXED"
+        render.threads = threads
+    else:
+        render.threads_mode = "AUTO"
+
+
+class JobTimings:
+    """Wall/CPU time per pipeline stage for one job, written as one JSON line to the timings log."""
+
+    def __init__(self, stl_path, output_path):
+        self.record = {
+            "stl_path": os.path.abspath(stl_path),
+            "output_path": os.path.abspath(output_path),
+            "profile": profile,
+            "stages": {},
+        }
+
+    @contextmanager
+    def stage(self, name):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.record["stages"][name] = {
+                "wall": round(time.perf_counter() - wall, 4),
+                "cpu": round(time.process_time() - cpu, 4),
+            }
+
+    def wall(self, *names):
+        return sum(self.record["stages"].get(name, {}).get("wall", 0.0) for name in names)
+
+    def write(self, path):
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KiB on Linux and bytes on macOS.
+        self.record["peak_rss_mb"] = round(usage / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+        self.record["rss_mb"] = current_rss_mb()
+        self.record["datablocks"] = datablock_counts()
+        with open(path, "a") as f:
+            f.write(json.dumps(self.record) + "\n")
+
+
+def _load_stimulus(stl_path, args, timings, stl_hash=None):
+    """Import and normalize one STL (through the mesh cache when enabled); returns (obj, object_size)."""
+    use_cache = args.mesh_cache and stl_importer == "native"
+    with timings.stage("import"):
+        if use_cache:
+            obj = import_cached_stl(stl_path, args.mesh_cache, target_size=2.0, stl_hash=stl_hash)
+        else:
+            obj = import_stl(stl_path)
+    timings.record["vertices"] = len(obj.data.vertices)
+    timings.record["faces"] = len(obj.data.polygons)
+    if not timings.record["faces"]:
+        raise ValueError(f"STL has no usable triangles: {stl_path}")
+    budget = triangle_budget()
+    if budget and timings.record["faces"] > budget:
+        with timings.stage("decimate"):
+            ratio = decimate_to_budget(obj, budget)
+        timings.record["lod"] = {"budget": budget, "faces": len(obj.data.polygons), "ratio": round(ratio, 4)}
+        print(f"LOD: {timings.record['faces']} → {len(obj.data.polygons)} triangles ({ratio:.1%})")
+    with timings.stage("center_and_scale"):
+        object_size = 2.0 if use_cache else center_and_scale_object(obj, target_size=2.0)
+    return obj, object_size
+
+
+def _stage_stimulus(stl_path, args, stats, timings, stl_hash=None):
+    """Clear (or reuse, with --template) the scene, load stl_path and set it up; returns (obj, object_size)."""
+    with timings.stage("clear_scene"):
+        if args.template and not _template_ready():
+            rig_start = time.perf_counter()
+            setup_template_scene(2.0)
+            stats["rig_build"] = time.perf_counter() - rig_start
+        elif args.template:
+            _remove_objects(_template.pop("batch", []))
+        elif not args.template:
             clear_scene()
-            bpy.ops.import_mesh.stl(filepath=stl_path)
-            obj = bpy.context.selected_objects[0]
-            object_size = center_and_scale_object(obj, target_size=2.0)
+    obj, object_size = _load_stimulus(stl_path, args, timings, stl_hash)
+    with timings.stage("setup_scene"):
+        if args.template:
+            obj = swap_template_mesh(obj, object_size)
+        else:
             setup_scene(obj, object_size)
-            animate_rotation(obj, frames)
+    stats["setup"] += timings.wall("clear_scene", "setup_scene")
+    stats["jobs"] += 1
+    return obj, object_size
+
+
+def render_job(stl_path, output_path, args, stats, key="", encoder=None, on_done=None, stl_hash=None):
+    """Import, normalize, stage and render one STL; scene setup time is added to stats.
+
+    A JobTimings record goes to args.timings_log once the output is final, then on_done(output_path)
+    runs (after the queued encode in pipeline mode).
+    """
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    print(f"Processing {stl_path}")
+    timings = JobTimings(stl_path, output_path)
+    obj, object_size = _stage_stimulus(stl_path, args, stats, timings, stl_hash)
+    with timings.stage("animate_rotation"):
+        animate_rotation(obj, frames)
+    with timings.stage("auto_crop"):
+        timings.record["crop_fraction"] = round(set_render_border([obj] if args.auto_crop else None), 4)
+    sources = None
+    if args.symmetry:
+        with timings.stage("symmetry"):
+            order, sources = detect_symmetry(obj, args.symmetry_tolerance)
+        unique = unique_frames(sources)
+        timings.record["symmetry"] = {"order": order, "unique_frames": unique}
+        stats.setdefault("symmetry", []).append((stl_path, order, frames - unique))
+
+    # The record is complete once both the render stage and the (possibly queued) encode are done.
+    state = {"rendered": False, "encoded": False}
+
+    def complete():
+        timings.write(args.timings_log)
+        if on_done is not None:
+            on_done(output_path)
+
+    def finished(path, encode=None):
+        # Blender's FFMPEG writer encodes inline during render, so there is no separate encode stage.
+        timings.record["stages"]["encode"] = encode
+        state["encoded"] = True
+        if state["rendered"]:
+            complete()
+
+    with FrameStats() as frame_stats, timings.stage("render"):
+        if args.sequence:
+            render_sequence_video(output_path, args.sequence, key, args.keep_frames, encoder, finished, sources)
+        else:
             render_video(output_path)
-            print(f"✅ Rendered: {output_path}")
+    timings.record["frames"] = frame_stats.frames
+    if args.sequence:
+        # The synchronous encode ran inside the render stage; report it separately.
+        encode = timings.record["stages"].get("encode")
+        if encode:
+            render = timings.record["stages"]["render"]
+            render["wall"] = round(render["wall"] - encode["wall"], 4)
+    print(f"Frame stats: {frame_stats.summary()}")
+    if args.frame_log:
+        with open(args.frame_log, "a") as f:
+            for frame in frame_stats.frames:
+                f.write(json.dumps({"output": os.path.abspath(output_path), **frame}) + "\n")
+    state["rendered"] = True
+    if not args.sequence:
+        finished(output_path)
+    elif state["encoded"]:
+        complete()
+    print(f"✅ Rendered: {output_path}")
+
+
+def render_still(path):
+    """Render the current frame to a PNG at path (atomically, like render_frames)."""
+    scene = bpy.context.scene
+    tmp_path = os.path.splitext(path)[0] + ".partial.png"
+    scene.render.image_settings.file_format = "PNG"
+    scene.render.filepath = tmp_path
+    try:
+        bpy.ops.render.render(write_still=True)
+    finally:
+        scene.render.image_settings.file_format = file_format
+    os.replace(tmp_path, path)
+
+
+def _prepare_stills_dir(stills_dir, key):
+    """Like _prepare_frames_dir for a published still grid: the key lives in a hidden sibling file, and a
+    changed key removes only the stills themselves."""
+    key_file = stills_key_path(stills_dir)
+    previous = None
+    if os.path.exists(key_file):
+        with open(key_file) as f:
+            previous = f.read()
+    if previous != key and os.path.isdir(stills_dir):
+        for name in os.listdir(stills_dir):
+            if is_still_name(name):
+                os.remove(os.path.join(stills_dir, name))
+    os.makedirs(stills_dir, exist_ok=True)
+    with open(key_file, "w") as f:
+        f.write(key)
+
+
+def render_stills(obj, cam, object_size, view, stills_dir, key=""):
+    """Turntable still grid: obj turned to each azimuth about the view axis, seen from each elevation."""
+    _prepare_stills_dir(stills_dir, key)
+    obj.animation_data_clear()
+    set_render_border(None)
+    axis_index = "XYZ".index(view["axis"])
+    for elevation in view["elevations"]:
+        fit_camera(cam, object_size, elevation)
+        for azimuth in view["azimuths"]:
+            path = os.path.join(stills_dir, still_name(azimuth, elevation))
+            if os.path.exists(path):
+                continue
+            rotation = [0.0, 0.0, 0.0]
+            rotation[axis_index] = radians(azimuth)
+            obj.rotation_euler = rotation
+            render_still(path)
+
+
+def render_views(stl_path, output_path, outputs, args, stats, encoder=None, stl_hash=None):
+    """Render several views (view_spec.py) of one STL from a single import and scene setup.
+
+    outputs are dicts with view, output_path, key and on_done(path), called as each output becomes final.
+    One JobTimings record with a stage per view is written once the last (possibly queued) encode is done.
+    """
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    print(f"Processing {stl_path} ({len(outputs)} views)")
+    timings = JobTimings(stl_path, output_path)
+    timings.record["views"] = [output["view"]["name"] for output in outputs]
+    obj, object_size = _stage_stimulus(stl_path, args, stats, timings, stl_hash)
+    cam = bpy.context.scene.camera
+    # The render loop plus each view still to be encoded; the record is written when none is left.
+    outstanding = [1]
+
+    def release():
+        outstanding[0] -= 1
+        if not outstanding[0]:
+            timings.write(args.timings_log)
+
+    def finisher(output):
+        def finished(path, encode=None):
+            timings.record["stages"][f"encode:{output['view']['name']}"] = encode
+            output["on_done"](path)
+            print(f"✅ Rendered: {path}")
+            release()
+
+        return finished
+
+    try:
+        for output in outputs:
+            view, path = output["view"], output["output_path"]
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            outstanding[0] += 1
+            with timings.stage(f"view:{view['name']}"):
+                if view["type"] == "stills":
+                    render_stills(obj, cam, object_size, view, path, output["key"])
+                    finisher(output)(path)
+                    continue
+                fit_camera(cam, object_size, view["elevation"])
+                animate_rotation(obj, frames, axis=view["axis"])
+                set_render_border([obj] if args.auto_crop else None, axis=view["axis"])
+                sources = None
+                if args.symmetry:
+                    sources = detect_symmetry(obj, args.symmetry_tolerance, view["axis"])[1]
+                if args.sequence:
+                    render_sequence_video(
+                        path, args.sequence, output["key"], args.keep_frames, encoder, finisher(output), sources
+                    )
+                else:
+                    render_video(path)
+                    finisher(output)(path)
+    finally:
+        # The template camera is shared with later jobs.
+        fit_camera(cam, object_size)
+    release()
+
+
+def _remove_objects(objects):
+    for obj in objects:
+        try:
+            mesh = obj.data
+            action = obj.animation_data.action if obj.animation_data else None
+        except ReferenceError:
+            continue
+        bpy.data.objects.remove(obj)
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+        if action is not None and action.users == 0:
+            bpy.data.actions.remove(action)
+
+
+@contextmanager
+def _slot_progress(jobs, progress_path):
+    """Keep the --progress file on the batch slot whose frames are rendering, so the watchdog blames that STL."""
+    if not progress_path:
+        yield
+        return
+    current = [None]
+
+    def on_pre(scene, *args):
+        slot = min((scene.frame_current - 1) // frames, len(jobs) - 1)
+        if slot != current[0]:
+            current[0] = slot
+            write_progress(progress_path, jobs[slot]["stl_path"], jobs[slot]["output_path"])
+
+    bpy.app.handlers.render_pre.append(on_pre)
+    try:
+        yield
+    finally:
+        bpy.app.handlers.render_pre.remove(on_pre)
+
+
+def render_batch(jobs, args, stats, encoder=None):
+    """Render several STLs in one animation on the template rig, then split it into per-object videos.
+
+    jobs are dicts with stl_path, output_path, key, stl_hash and on_done. Object i is visible and
+    spinning only in frames i*frames+1 .. (i+1)*frames; the combined range is rendered once into a
+    shared frame folder (resumable), moved into each object's <name>_frames/ and encoded.
+    """
+    if not _template_ready():
+        rig_start = time.perf_counter()
+        setup_template_scene(2.0)
+        stats["rig_build"] = time.perf_counter() - rig_start
+    stale = _template.pop("batch", [])
+    if "object" in _template:
+        stale.append(_template.pop("object"))
+    _remove_objects(stale)
+    purge_orphans()
+    batch_key = "\n".join(job["key"] for job in jobs)
+    batch_dir = os.path.join(
+        os.path.dirname(jobs[0]["output_path"]),
+        ".batch_" + hashlib.sha256(batch_key.encode()).hexdigest()[:12],
+    )
+    objects = []
+    job_timings = []
+    for index, job in enumerate(jobs):
+        os.makedirs(os.path.dirname(job["output_path"]), exist_ok=True)
+        print(f"Processing {job['stl_path']} (batch slot {index + 1}/{len(jobs)})")
+        write_progress(args.progress, job["stl_path"], job["output_path"])
+        timings = JobTimings(job["stl_path"], job["output_path"])
+        timings.record["batch_size"] = len(jobs)
+        obj, object_size = _load_stimulus(job["stl_path"], args, timings, job["stl_hash"])
+        with timings.stage("setup_scene"):
+            apply_material(obj, _template["material"])
+        stats["setup"] += timings.wall("setup_scene")
+        stats["jobs"] += 1
+        with timings.stage("animate_rotation"):
+            start_frame = index * frames + 1
+            animate_rotation(obj, frames, start_frame=start_frame)
+            key_visibility_window(obj, start_frame, start_frame + frames - 1)
+        objects.append(obj)
+        job_timings.append(timings)
+    _template["batch"] = objects
+    crop_fraction = round(set_render_border(objects if args.auto_crop else None), 4)
+
+    scene = bpy.context.scene
+    ext = FRAME_EXTENSIONS[args.sequence]
+    _prepare_frames_dir(batch_dir, batch_key)
+    existing = sorted(name for name in os.listdir(batch_dir) if name.endswith("." + ext))
+    if existing:
+        # Frames are written in order; the newest one may have been cut off by a crash.
+        os.remove(os.path.join(batch_dir, existing[-1]))
+    scene.frame_start = 1
+    scene.frame_end = len(jobs) * frames
+    scene.render.image_settings.file_format = args.sequence
+    scene.render.filepath = os.path.join(batch_dir, "frame_")
+    scene.render.use_overwrite = False
+    render_start = time.perf_counter()
+    try:
+        with FrameStats() as frame_stats, _slot_progress(jobs, args.progress):
+            bpy.ops.render.render(animation=True)
+    finally:
+        scene.render.image_settings.file_format = file_format
+        scene.render.use_overwrite = True
+    render_share = round((time.perf_counter() - render_start) / len(jobs), 4)
+
+    for index, (job, timings) in enumerate(zip(jobs, job_timings)):
+        write_progress(args.progress, job["stl_path"], job["output_path"])
+        offset = index * frames
+        frames_dir = frames_dir_for(job["output_path"])
+        _prepare_frames_dir(frames_dir, job["key"])
+        for frame in range(1, frames + 1):
+            os.replace(frame_path(batch_dir, offset + frame, ext), frame_path(frames_dir, frame, ext))
+        # Wall time of the shared render is split evenly; per-frame records carry the exact numbers.
+        timings.record["stages"]["render"] = {"wall": render_share, "cpu": None}
+        timings.record["crop_fraction"] = crop_fraction
+        timings.record["frames"] = [
+            {**f, "frame": f["frame"] - offset} for f in frame_stats.frames if offset < f["frame"] <= offset + frames
+        ]
+
+        def finished(path, encode=None, timings=timings, on_done=job["on_done"]):
+            timings.record["stages"]["encode"] = encode
+            timings.write(args.timings_log)
+            if on_done is not None:
+                on_done(path)
+
+        encode_frames(job["output_path"], args.sequence, args.keep_frames, encoder, finished)
+        print(f"✅ Rendered: {job['output_path']}")
+    shutil.rmtree(batch_dir)
+
+
+def _report_setup_time(args, stats):
+    if not stats["jobs"]:
+        return
+    per_job = stats["setup"] / stats["jobs"]
+    print(f"Scene setup: {stats['setup']:.2f}s over {stats['jobs']} jobs ({per_job * 1000:.1f} ms/job)")
+    if args.template and "rig_build" in stats:
+        # Building the rig once costs what the rebuild path pays on every job.
+        rebuild = stats["rig_build"] * stats["jobs"]
+        saved = rebuild - stats["setup"]
+        print(f"Template scene saved ~{saved:.2f}s vs rebuilding per STL (est. {rebuild:.2f}s)")
+
+
+def _report_symmetry(stats):
+    found = stats.get("symmetry")
+    if not found:
+        return
+    saved = sum(count for _, _, count in found)
+    print(f"Symmetry: {saved}/{len(found) * frames} frames reused over {len(found)} jobs")
+    for stl_path, order, count in found:
+        if order > 1:
+            print(f"  {order}-fold about {rotation_axis}: {stl_path} ({count} frames reused)")
+
+
+def configure(args):
+    """Push the command-line render options (profile, sampling, LOD, variants, threads, importer) to the module and scene."""
+    global stl_importer
+    apply_profile(args.profile)
+    apply_sampling_options(args.max_samples, args.noise_threshold, args.frame_time_limit)
+    apply_persistent_data(args.persistent_data)
+    apply_lod(args.lod or args.triangle_budget > 0, args.triangle_budget)
+    apply_variants(args.variants)
+    apply_thread_budget(args.threads)
+    stl_importer = args.importer
+
+
+# One LeakCheck per batch size for the whole Blender session (resident workers call render_jobs per job).
+_leak_checks = {}
+
+
+def _after_job(leaks, args, label):
+    counts = leaks.after_job(label)
+    if args.memory_report:
+        blocks = " ".join(f"{name}={n}" for name, n in counts.items() if n)
+        print(f"Memory: rss {current_rss_mb()} MB, datablocks {blocks}")
+
+
+def add_missing_variants(output_path, key, image_format="PNG"):
+    """Encode the --variants an up-to-date output lacks, without rendering; returns the encode timings or None.
+
+    Uses the frames kept with --keep-frames when they belong to this render (same key), else the output video.
+    """
+    missing = [variant for variant in variant_outputs(output_path) if not os.path.exists(variant[0])]
+    if not missing:
+        return None
+    ext = FRAME_EXTENSIONS[image_format]
+    frames_dir = frames_dir_for(output_path)
+    key_file = os.path.join(frames_dir, "render_key.txt")
+    source = output_path
+    if os.path.exists(key_file) and not missing_frames(frames_dir, frames, ext):
+        with open(key_file) as f:
+            if f.read() == key:
+                source = frames_dir
+    print(f"Encoding {len(missing)} missing variants of {output_path} from {source}")
+    return encode_variants(source, missing, fps, ext, constant_rate_factor, x264=scene_x264_args())
+
+
+def _refresh_variants(output_path, stl_path, stl_hash, settings_digest, manifest_file, args, video=True, **fields):
+    """For an output whose pixels are current: encode missing variants and list them in the manifest."""
+    if not video or not variants:
+        return
+    key = f"{stl_hash} {settings_digest}"
+    try:
+        encode = add_missing_variants(output_path, key, args.sequence or "PNG")
+    except (subprocess.CalledProcessError, OSError) as exc:
+        error = f"variant encode failed: {type(exc).__name__}: {exc}"
+        print(f"❌ {output_path}: {error}")
+        record_failure(args.failures_log, stl_path, output_path, error, "".join(traceback.format_exception(exc)))
+        return
+    if encode is not None:
+        entry = _output_entry(output_path, stl_path, stl_hash, settings_digest, video, **fields)
+        record_output(manifest_file, output_path, entry)
+
+
+def _output_entry(output_path, stl_path, stl_hash, settings_digest, video=True, **fields):
+    """Manifest entry for one output; video outputs list their variant files (relative to the output)."""
+    entry = {
+        "stl": os.path.abspath(stl_path),
+        "stl_hash": stl_hash,
+        "settings_hash": settings_digest,
+        "profile": profile,
+        **fields,
+    }
+    if video and variants:
+        entry["variants"] = {
+            os.path.basename(path): {"width": width, "format": container}
+            for path, width, container in variant_outputs(output_path)
+        }
+    return entry
+
+
+def _pending_views(views, manifest, manifest_file, output_path, stl_path, stl_hash, args):
+    """render_views outputs for the views of one job that are not current in the manifest."""
+    outputs = []
+    for view in views:
+        path = view_output_path(output_path, view)
+        # Each view output has its own settings hash, so editing one view re-renders only that one.
+        digest = settings_hash({**render_settings(), "view": view})
+        video = view["type"] == "spin"
+        if not args.force and is_current(manifest, manifest_file, path, stl_hash, digest):
+            _refresh_variants(path, stl_path, stl_hash, digest, manifest_file, args, video, view=view["name"])
+            continue
+        entry = _output_entry(path, stl_path, stl_hash, digest, video, view=view["name"])
+        outputs.append({
+            "view": view,
+            "output_path": path,
+            "key": f"{stl_hash} {digest}",
+            "on_done": lambda path, entry=entry: record_output(manifest_file, path, entry),
+        })
+    return outputs
+
+
+def _reset_after_failure():
+    """Drop whatever a failed job left in the scene; the template rig is rebuilt on the next job."""
+    _template.clear()
+    bpy.context.scene.render.image_settings.file_format = file_format
+    clear_scene()
+
+
+def _record_encode_failures(encoder, owners, args, failures):
+    """Log failed background encodes against the job whose output they were, not the job that reaped them."""
+    if encoder is None:
+        return
+    for output_path, exc in encoder.take_failures():
+        job = owners[output_path]
+        error = f"encode failed: {type(exc).__name__}: {exc}"
+        print(f"❌ {job['stl_path']}: {error}")
+        trace = "".join(traceback.format_exception(exc))
+        record_failure(args.failures_log, job["stl_path"], output_path, error, trace)
+        failures.append(error)
+
+
+def _run_isolated(job, args, stats, encoder, failures):
+    """render_job that records an exception (with traceback) to the failures log instead of raising."""
+    write_progress(args.progress, job["stl_path"], job["output_path"])
+    try:
+        if job.get("views"):
+            render_views(job["stl_path"], job["output_path"], job["views"], args, stats, encoder, job["stl_hash"])
+            return True
+        render_job(
+            job["stl_path"],
+            job["output_path"],
+            args,
+            stats,
+            key=job["key"],
+            encoder=encoder,
+            on_done=job["on_done"],
+            stl_hash=job["stl_hash"],
+        )
+        return True
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        print(f"❌ {job['stl_path']}: {error}")
+        record_failure(args.failures_log, job["stl_path"], job["output_path"], error, traceback.format_exc())
+        failures.append(error)
+        _reset_after_failure()
+        return False
+    finally:
+        write_progress(args.progress)
+
+
+def render_jobs(jobs, output_folder, args):
+    """Render (stl_path, output_path) pairs not already current in output_folder's manifest.
+
+    A job that raises is logged to the failures log and the run continues with the next one.
+    Returns {"rendered": n, "skipped": n, "failed": n, "errors": [...]}.
+    """
+    args = argparse.Namespace(**vars(args))
+    log_base = os.path.normpath(os.path.abspath(output_folder))
+    if not args.timings_log:
+        args.timings_log = log_base + "_timings.jsonl"
+    if not args.failures_log:
+        args.failures_log = log_base + "_failures.jsonl"
+    failures = []
+    stats = {"setup": 0.0, "jobs": 0}
+    manifest_file = manifest_path(output_folder)
+    manifest = load_manifest(manifest_file)
+    settings_digest = settings_hash(render_settings())
+    skipped = 0
+    encoder = EncodeQueue(args.pipeline) if args.pipeline else None
+    pending = []
+    views = load_views(args.views) if args.views else None
+    for stl_path, output_path in jobs:
+        stl_hash = file_hash(stl_path)
+        if views:
+            outputs = _pending_views(views, manifest, manifest_file, output_path, stl_path, stl_hash, args)
+            if outputs:
+                pending.append({"stl_path": stl_path, "output_path": output_path, "stl_hash": stl_hash, "views": outputs})
+            else:
+                skipped += 1
+            continue
+        if not args.force and is_current(manifest, manifest_file, output_path, stl_hash, settings_digest):
+            _refresh_variants(output_path, stl_path, stl_hash, settings_digest, manifest_file, args)
+            skipped += 1
+            continue
+        entry = _output_entry(output_path, stl_path, stl_hash, settings_digest)
+        pending.append({
+            "stl_path": stl_path,
+            "output_path": output_path,
+            "key": f"{stl_hash} {settings_digest}",
+            "stl_hash": stl_hash,
+            "on_done": lambda path, entry=entry: record_output(manifest_file, path, entry),
+        })
+    owners = {}
+    for job in pending:
+        for output in job.get("views") or [job]:
+            owners[output["output_path"]] = job
+    leaks = _leak_checks.setdefault(args.batch_size, LeakCheck(args.check_leaks))
+    # --check-leaks raises between jobs; the encodes already queued still finish and get recorded.
+    try:
+        if args.batch_size > 1:
+            for start in range(0, len(pending), args.batch_size):
+                batch = pending[start:start + args.batch_size]
+                try:
+                    render_batch(batch, args, stats, encoder)
+                except Exception as exc:
+                    # Render the batch one by one so only the bad STL ends up in the failures log.
+                    print(f"❌ Batch failed ({type(exc).__name__}: {exc}); rendering its jobs individually")
+                    _reset_after_failure()
+                    for job in batch:
+                        _run_isolated(job, args, stats, encoder, failures)
+                    continue
+                finally:
+                    write_progress(args.progress)
+                    _record_encode_failures(encoder, owners, args, failures)
+                # A short final batch loads fewer objects, so only full batches are compared.
+                if len(batch) == args.batch_size:
+                    _after_job(leaks, args, f"batch of {len(batch)} ending {batch[-1]['stl_path']}")
+        else:
+            for job in pending:
+                if _run_isolated(job, args, stats, encoder, failures):
+                    _after_job(leaks, args, job["stl_path"])
+                _record_encode_failures(encoder, owners, args, failures)
+    finally:
+        if encoder is not None:
+            encoder.drain()
+            _record_encode_failures(encoder, owners, args, failures)
+    if skipped:
+        print(f"Skipped {skipped} up-to-date outputs (see {manifest_file})")
+    _report_setup_time(args, stats)
+    _report_symmetry(stats)
+    if failures:
+        print(f"❌ {len(failures)} jobs failed (see {args.failures_log})")
+    return {"rendered": len(pending) - len(failures), "skipped": skipped, "failed": len(failures), "errors": failures}
+
+
+def serve_queue(queue_dir, args):
+    """Resident worker: render jobs from a render_queue.py directory until `render_queue.py stop`.
+
+    The module, add-ons and (with --template) the scene rig are loaded once for every job.
+    """
+    base_profile = args.profile
+
+    def handle(job):
+        job_args = argparse.Namespace(**vars(args))
+        job_args.profile = job.get("profile") or base_profile
+        job_args.force = job.get("force") or args.force
+        if job_args.profile != profile:
+            configure(job_args)
+        output_folder = job.get("output_folder") or os.path.dirname(job["output_path"])
+        start = time.perf_counter()
+        result = render_jobs([(job["stl_path"], job["output_path"])], output_folder, job_args)
+        if result["failed"]:
+            raise RuntimeError(result["errors"][0])
+        return {**result, "seconds": round(time.perf_counter() - start, 3)}
+
+    print(f"Serving render queue {queue_dir}")
+    serve(queue_dir, handle, idle_exit=args.idle_exit)
+
+
+def main(input_folder: str, output_folder: str, args=None):
+    """Walk input_folder for .stl (any depth), mirror relative paths under output_folder."""
+    if args is None:
+        args = parse_args()
+    configure(args)
+    if args.serve:
+        serve_queue(args.serve, args)
+        return
+    os.makedirs(output_folder, exist_ok=True)
+    input_folder = os.path.abspath(input_folder)
+    if args.jobs_file:
+        jobs = read_jobs_file(args.jobs_file)
+    else:
+        jobs = iter_jobs(input_folder, output_folder)
+    if args.allow_list:
+        jobs = filter_jobs(jobs, read_allow_list(args.allow_list))
+    render_jobs(jobs, output_folder, args)
     print("✅ All STL files processed.")
@@ -0,0 +1,142 @@
+"""
+Pre-render STL triage with NumPy, one process per core. No bpy import.
+
+  python scripts/stl_validate.py data/abstract-25/stl
+  ./blender-4.5.0-linux-x64/blender -b -P scripts/render_worker.py -- --input IN --output OUT \
+      --allow-list data/abstract-25/stl_allow.txt
+
+Errors (the file is left out of the allow-list): empty, truncated binary (declared triangle count does
+not match the file size), no triangles, NaN/inf coordinates, every triangle degenerate, zero extent,
+more than --max-triangles triangles. Warnings (still allowed): some degenerate triangles.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from stl_io import HEADER_SIZE, RECORD_DTYPE, declared_count, is_binary, read_triangles
+from stl_jobs import iter_jobs
+
+DEFAULT_MAX_TRIANGLES = 1_000_000
+
+
+def _truncation(path, size):
+    """Error message if a binary STL's size disagrees with its declared triangle count, else None."""
+    if size < HEADER_SIZE:
+        return f"shorter than the {HEADER_SIZE}-byte binary header ({size} bytes)"
+    count = declared_count(path)
+    expected = HEADER_SIZE + count * RECORD_DTYPE.itemsize
+    if size != expected:
+        complete = (size - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        return f"declares {count} triangles but holds {complete} ({size} bytes, expected {expected})"
+    return None
+
+
+def check_stl(path, max_triangles=DEFAULT_MAX_TRIANGLES):
+    """{"path", "status": ok|warning|error, "issues", "triangles", "degenerate", "extent", "seconds"} for one STL."""
+    start = time.perf_counter()
+    result = {"path": os.path.abspath(path), "triangles": 0, "degenerate": 0, "extent": None}
+    errors, warnings = [], []
+    size = os.path.getsize(path)
+    if size == 0:
+        errors.append("empty file")
+    elif is_binary(path) and (problem := _truncation(path, size)):
+        errors.append(f"truncated: {problem}")
+    else:
+        triangles = read_triangles(path)
+        result["triangles"] = len(triangles)
+        if not len(triangles):
+            errors.append("no triangles")
+        elif len(triangles) > max_triangles:
+            errors.append(f"{len(triangles)} triangles (limit {max_triangles})")
+        else:
+            corners = np.asarray(triangles, dtype=np.float64)
+            finite = np.isfinite(corners).all(axis=(1, 2))
+            if not finite.all():
+                errors.append(f"{int((~finite).sum())} triangles with NaN/inf coordinates")
+                corners = corners[finite]
+            if len(corners):
+                extent = corners.reshape(-1, 3).max(axis=0) - corners.reshape(-1, 3).min(axis=0)
+                result["extent"] = [round(float(v), 6) for v in extent]
+                max_dim = float(extent.max())
+                if max_dim <= 0:
+                    errors.append("zero extent (all vertices coincide)")
+                else:
+                    # Zero area relative to the object size: repeated corners or collinear corners.
+                    area = np.linalg.norm(np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]), axis=1)
+                    degenerate = int((area <= 1e-12 * max_dim * max_dim).sum())
+                    result["degenerate"] = degenerate
+                    if degenerate == len(corners):
+                        errors.append("every triangle is degenerate")
+                    elif degenerate:
+                        warnings.append(f"{degenerate} degenerate triangles")
+    result["status"] = "error" if errors else "warning" if warnings else "ok"
+    result["issues"] = errors + warnings
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def _check(args):
+    path, max_triangles = args
+    try:
+        return check_stl(path, max_triangles)
+    except Exception as exc:
+        return {"path": os.path.abspath(path), "status": "error", "issues": [f"{type(exc).__name__}: {exc}"]}
+
+
+def validate(paths, max_triangles=DEFAULT_MAX_TRIANGLES, workers=None):
+    """check_stl over paths in a process pool; results in input order."""
+    tasks = [(path, max_triangles) for path in paths]
+    if workers == 1 or len(tasks) < 2:
+        return [_check(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_check, tasks, chunksize=max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1)))))
+
+
+def write_report(path, results, seconds):
+    counts = {status: sum(1 for r in results if r["status"] == status) for status in ("ok", "warning", "error")}
+    with open(path, "w") as f:
+        json.dump({"files": len(results), **counts, "seconds": round(seconds, 3), "results": results}, f, indent=1)
+
+
+def write_allow_list(path, results):
+    """One absolute STL path per line for every file without errors (stl_spin_render --allow-list)."""
+    with open(path, "w") as f:
+        for result in results:
+            if result["status"] != "error":
+                f.write(result["path"] + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input_folder")
+    parser.add_argument("--report", help="JSON triage report (default: INPUT_validation.json)")
+    parser.add_argument("--allow-list", help="paths that passed (default: INPUT_allow.txt)")
+    parser.add_argument("--max-triangles", type=int, default=DEFAULT_MAX_TRIANGLES)
+    parser.add_argument("--workers", type=int, help="processes (default: all cores)")
+    args = parser.parse_args(argv)
+    base = os.path.normpath(os.path.abspath(args.input_folder))
+    paths = sorted(stl_path for stl_path, _ in iter_jobs(base, base))
+    start = time.perf_counter()
+    results = validate(paths, args.max_triangles, args.workers)
+    seconds = time.perf_counter() - start
+    report = args.report or base + "_validation.json"
+    allow_list = args.allow_list or base + "_allow.txt"
+    write_report(report, results, seconds)
+    write_allow_list(allow_list, results)
+    for result in results:
+        if result["status"] != "ok":
+            marker = "❌" if result["status"] == "error" else "⚠️"
+            print(f"{marker} {os.path.relpath(result['path'], base)}: {'; '.join(result['issues'])}")
+    errors = sum(1 for r in results if r["status"] == "error")
+    print(f"{len(results)} STLs checked in {seconds:.2f}s: {len(results) - errors} allowed, {errors} rejected")
+    print(f"Report: {report}\nAllow-list: {allow_list}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
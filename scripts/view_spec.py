@@ -0,0 +1,83 @@
+"""
+Multi-view job spec for stl_spin_render --views: several outputs per STL from one import and scene setup.
+No bpy import. The spec is a JSON list of views:
+
+  [
+    {"name": "z", "type": "spin", "axis": "Z"},
+    {"name": "x", "type": "spin", "axis": "X"},
+    {"name": "z_high", "type": "spin", "axis": "Z", "elevation": 45},
+    {"name": "grid", "type": "stills", "azimuths": 8, "elevations": [0, 30, 60]}
+  ]
+
+spin: a rotation video about axis (default Z); elevation is the camera's height angle in degrees
+(omitted: the standard camera). stills: the object turned to each azimuth (a count spread over 360°,
+or a list of degrees) about axis, photographed from each elevation; one PNG per pair.
+For output OUT/name.mp4, a spin goes to OUT/name_<view>.mp4 and stills to OUT/name_<view>/.
+"""
+import json
+import os
+import re
+
+AXES = ("X", "Y", "Z")
+_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+_STILL = re.compile(r"^az\d{3}\.\d_el[+-]\d{2}\.\d\.png$")
+
+
+def _check(view, index):
+    name = view.get("name")
+    if not isinstance(name, str) or not _NAME.match(name):
+        raise ValueError(f"view {index}: name must be letters, digits, '_', '.' or '-', got {name!r}")
+    kind = view.get("type", "spin")
+    axis = str(view.get("axis", "Z")).upper()
+    if axis not in AXES:
+        raise ValueError(f"view {name}: axis must be one of {', '.join(AXES)}")
+    if kind == "spin":
+        elevation = view.get("elevation")
+        return {"name": name, "type": kind, "axis": axis, "elevation": None if elevation is None else float(elevation)}
+    if kind == "stills":
+        azimuths = view.get("azimuths", 8)
+        if isinstance(azimuths, int):
+            azimuths = [360 * i / azimuths for i in range(max(azimuths, 1))]
+        elevations = view.get("elevations", [0])
+        return {
+            "name": name,
+            "type": kind,
+            "axis": axis,
+            "azimuths": [float(a) for a in azimuths],
+            "elevations": [float(e) for e in elevations],
+        }
+    raise ValueError(f"view {name}: type must be 'spin' or 'stills', got {kind!r}")
+
+
+def load_views(path):
+    """Validated, normalized list of view dicts from a JSON spec file."""
+    with open(path) as f:
+        views = json.load(f)
+    if not isinstance(views, list) or not views:
+        raise ValueError(f"{path}: expected a non-empty JSON list of views")
+    views = [_check(view, index) for index, view in enumerate(views)]
+    names = [view["name"] for view in views]
+    if len(set(names)) != len(names):
+        raise ValueError(f"{path}: view names must be unique")
+    return views
+
+
+def view_output_path(output_path, view):
+    base = os.path.splitext(output_path)[0]
+    if view["type"] == "stills":
+        return f"{base}_{view['name']}"
+    return f"{base}_{view['name']}{os.path.splitext(output_path)[1]}"
+
+
+def still_name(azimuth, elevation):
+    return f"az{azimuth:05.1f}_el{elevation:+05.1f}.png"
+
+
+def is_still_name(filename):
+    return _STILL.match(filename) is not None
+
+
+def stills_key_path(stills_dir):
+    """Resume key for a still grid, kept beside (not inside) the published folder."""
+    parent, name = os.path.split(os.path.normpath(stills_dir))
+    return os.path.join(parent, f".{name}.render_key")